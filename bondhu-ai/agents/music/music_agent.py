@@ -5,7 +5,11 @@ Enhanced with rate limiting and caching for production scale (1000+ users).
 """
 
 import asyncio
+import threading
+import requests
 import spotipy
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from spotipy.oauth2 import SpotifyOAuth, SpotifyClientCredentials
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta, timezone
@@ -14,7 +18,57 @@ from agents.base_agent import BaseAgent
 from core.config import get_config
 from api.models.schemas import DataSource, PersonalityTrait, MusicPreferences
 from core.rl.music_recommendation_rl import MusicRecommendationRL
-from core.services.rate_limiter import spotify_rate_limiter, spotify_cache, user_data_cache
+from core.services.rate_limiter import spotify_rate_limiter, spotify_batcher, spotify_cache, user_data_cache
+
+
+class _ThreadLocalSpotifySession(requests.Session):
+    """
+    Session handed to every agent's Spotify client, so agents reuse keep-alive
+    connections instead of opening a fresh TLS session per agent.
+    
+    requests.Session isn't thread-safe and spotipy calls run on a worker pool,
+    so each thread sends through its own session. close() is a no-op because
+    spotipy.Spotify.__del__ closes the session it was given, and this one
+    outlives every client.
+    
+    spotipy only builds its retrying session when it isn't given one, so each
+    thread's session mounts the same urllib3 Retry spotipy would (429/5xx,
+    honouring Retry-After) for calls made outside rate_limited_call.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
+    
+    def request(self, *args, **kwargs):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._build_thread_session()
+        return session.request(*args, **kwargs)
+    
+    @staticmethod
+    def _build_thread_session() -> requests.Session:
+        """New session with spotipy's default retry policy (as in Spotify._build_session)."""
+        session = requests.Session()
+        retry = Retry(
+            total=spotipy.Spotify.max_retries,
+            connect=None,
+            read=False,
+            allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE']),
+            status=spotipy.Spotify.max_retries,
+            backoff_factor=0.3,
+            status_forcelist=spotipy.Spotify.default_retry_codes,
+        )
+        adapter = HTTPAdapter(max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    def close(self):
+        pass
+
+
+_spotify_http_session = _ThreadLocalSpotifySession()
 
 class MusicIntelligenceAgent(BaseAgent):
     """
@@ -115,7 +169,10 @@ class MusicIntelligenceAgent(BaseAgent):
         try:
             if self.spotify_token:
                 # Use user token (full features)
-                self.spotify_client = spotipy.Spotify(auth=self.spotify_token)
+                self.spotify_client = spotipy.Spotify(
+                    auth=self.spotify_token,
+                    requests_session=_spotify_http_session
+                )
                 self.logger.info("Spotify client initialized with user token")
             else:
                 # Fallback to app-only credentials for non-user queries
@@ -123,7 +180,10 @@ class MusicIntelligenceAgent(BaseAgent):
                     client_id=self.config.spotify.client_id,
                     client_secret=self.config.spotify.client_secret,
                 )
-                self.spotify_client = spotipy.Spotify(auth_manager=creds)
+                self.spotify_client = spotipy.Spotify(
+                    auth_manager=creds,
+                    requests_session=_spotify_http_session
+                )
                 self.logger.info("Spotify client initialized with app credentials (no user token)")
         except Exception as e:
             self.logger.warning(f"Failed to initialize Spotify client: {e}")
@@ -304,24 +364,16 @@ Provide insights based on established music psychology research while being sens
             return cached_result
         
         try:
-            # Process in batches of 100 (Spotify limit) with rate limiting
-            all_features = []
-            for i in range(0, len(track_ids), 100):
-                batch = track_ids[i:i+100]
-                
-                # Make rate-limited API call
-                features = await spotify_rate_limiter.rate_limited_call(
-                    "audio_features",
-                    self.spotify_client.audio_features,
-                    batch
-                )
-                
-                if features:
-                    all_features.extend(features)
-                else:
-                    # Handle API failures gracefully (403 Forbidden, rate limits, etc.)
-                    self.logger.warning(f"Failed to get audio features for batch of {len(batch)} tracks - using fallbacks")
-                    # Don't add features to all_features - they'll be handled as missing later
+            # Batched (100 IDs per call) and coalesced with concurrent lookups
+            # on this client, with rate limiting
+            features = await spotify_batcher.fetch(
+                "audio_features",
+                self.spotify_client.audio_features,
+                track_ids
+            )
+            # Failed lookups (403 Forbidden, rate limits, etc.) come back as None
+            # and are handled as missing later
+            all_features = [f for f in features.values() if f]
             
             if not all_features:
                 self.logger.warning("No audio features retrieved from Spotify API - all tracks will use fallback values")
@@ -25,6 +25,8 @@ class DatabaseConfig:
     url: str = field(default_factory=lambda: os.getenv("SUPABASE_URL", ""))
     key: str = field(default_factory=lambda: os.getenv("SUPABASE_KEY", ""))
     service_role_key: str = field(default_factory=lambda: os.getenv("SUPABASE_SERVICE_ROLE_KEY", ""))
+    # Direct Postgres connection string, only used by bulk maintenance scripts/tasks
+    postgres_url: str = field(default_factory=lambda: os.getenv("DATABASE_URL", ""))
     
     def __post_init__(self):
         # Require Supabase credentials only in production; allow empty for local dev
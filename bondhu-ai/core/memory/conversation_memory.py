@@ -54,18 +54,17 @@ class ConversationMemoryManager:
             True if successful, False otherwise
         """
         try:
-            memory_data = {
-                "user_id": user_id,
-                "conversation_summary": conversation_summary,
-                "topics": topics,
-                "emotions": emotions,
-                "key_points": key_points,
-                "session_id": session_id,
-                "message_ids": message_ids,
-                "start_time": start_time.isoformat(),
-                "end_time": end_time.isoformat(),
-                "created_at": datetime.now().isoformat(),
-            }
+            memory_data = self.build_memory_row(
+                user_id=user_id,
+                conversation_summary=conversation_summary,
+                topics=topics,
+                emotions=emotions,
+                key_points=key_points,
+                session_id=session_id,
+                message_ids=message_ids,
+                start_time=start_time,
+                end_time=end_time,
+            )
 
             self._client.supabase.table("conversation_memories").insert(
                 memory_data
@@ -80,6 +79,64 @@ class ConversationMemoryManager:
             self.logger.error(f"Error creating conversation memory: {e}")
             return False
 
+    @staticmethod
+    def build_memory_row(
+        user_id: str,
+        conversation_summary: str,
+        topics: List[str],
+        emotions: List[str],
+        key_points: List[str],
+        session_id: str,
+        message_ids: List[str],
+        start_time: datetime,
+        end_time: datetime,
+    ) -> Dict[str, Any]:
+        """
+        Build a conversation_memories row without writing it.
+
+        Returns:
+            Row dictionary ready for insertion
+        """
+        return {
+            "user_id": user_id,
+            "conversation_summary": conversation_summary,
+            "topics": topics,
+            "emotions": emotions,
+            "key_points": key_points,
+            "session_id": session_id,
+            "message_ids": message_ids,
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+            "created_at": datetime.now().isoformat(),
+        }
+
+    def create_conversation_memories_bulk(
+        self, rows: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Insert many conversation memory rows in a single request.
+
+        Args:
+            rows: Rows built with build_memory_row
+
+        Returns:
+            Number of rows inserted (0 on failure)
+        """
+        if not rows:
+            return 0
+
+        try:
+            self._client.supabase.table("conversation_memories").insert(
+                rows
+            ).execute()
+
+            self.logger.info(f"Created {len(rows)} conversation memories in bulk")
+            return len(rows)
+
+        except Exception as e:
+            self.logger.error(f"Error bulk creating conversation memories: {e}")
+            return 0
+
     def get_recent_conversations(
         self, user_id: str, days: int = 7, limit: int = 10
     ) -> List[Dict[str, Any]]:
@@ -70,6 +70,44 @@ class MemoryIndexManager:
             self.logger.error(f"Error indexing conversation: {e}")
             return False
 
+    def index_conversations_bulk(
+        self, conversations: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Index the topics of many conversations with a single insert.
+
+        Args:
+            conversations: Dicts with user_id, session_id, topics and timestamp
+
+        Returns:
+            Number of index rows written (0 on failure)
+        """
+        index_rows = [
+            {
+                "user_id": conv["user_id"],
+                "session_id": conv["session_id"],
+                "topic": topic.lower(),
+                "timestamp": conv["timestamp"].isoformat(),
+                "index_type": "topic",
+            }
+            for conv in conversations
+            for topic in conv["topics"]
+        ]
+        if not index_rows:
+            return 0
+
+        try:
+            self._client.supabase.table("memory_index").insert(index_rows).execute()
+
+            self.logger.info(
+                f"Indexed {len(conversations)} conversations: {len(index_rows)} topics"
+            )
+            return len(index_rows)
+
+        except Exception as e:
+            self.logger.error(f"Error bulk indexing conversations: {e}")
+            return 0
+
     def _index_topic(
         self, user_id: str, session_id: str, topic: str, timestamp: datetime
     ) -> bool:
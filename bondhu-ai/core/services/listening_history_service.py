@@ -7,16 +7,28 @@ Handles:
 """
 
 import asyncio
-from typing import Dict, List, Any, Optional
+import time
+from typing import Dict, List, Any, Optional, Callable
 from datetime import datetime, timedelta
 import logging
 
 from core.database.supabase_client import get_supabase_client
 from core.database.models import PersonalityTrait
 from agents.music.music_agent import MusicIntelligenceAgent
+from core.services.rate_limiter import user_data_cache
 
 logger = logging.getLogger("bondhu.listening_history_service")
 
+# Audio feature columns stored on listening_history rows
+AUDIO_FEATURE_KEYS = (
+    'energy', 'valence', 'danceability', 'acousticness',
+    'instrumentalness', 'speechiness', 'liveness', 'tempo'
+)
+
+# Account creation time never changes, so it can be cached for a long time
+ACCOUNT_CREATED_TTL = 604800  # 7 days
+SECONDS_PER_DAY = 86400
+
 
 class ListeningHistoryService:
     """
@@ -45,7 +57,50 @@ class ListeningHistoryService:
         self.supabase = get_supabase_client()
         logger.info("ListeningHistoryService initialized with cold start strategy")
     
-    def get_user_account_age_days(self, user_id: str) -> Optional[int]:
+    async def _supa(self, fn: Callable[[], Any]) -> Any:
+        """
+        Run a blocking Supabase call in a worker thread.
+        
+        The Supabase client is synchronous, so executing queries directly
+        would stall the event loop for the full HTTP round-trip.
+        
+        Args:
+            fn: Zero-argument callable performing the query (ending in .execute())
+            
+        Returns:
+            Query result
+        """
+        return await asyncio.to_thread(fn)
+    
+    async def _get_account_created_ts(self, user_id: str) -> Optional[float]:
+        """
+        Get user account creation time as a POSIX timestamp.
+        
+        Cached so the cold start stage can be derived with plain timestamp
+        arithmetic instead of a profiles query on every recommendation.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Creation timestamp, or None if the profile is missing
+        """
+        cached = user_data_cache.get('account_created_at', user_id=user_id)
+        if cached is not None:
+            return float(cached)
+        
+        result = await self._supa(
+            lambda: self.supabase.supabase.table('profiles').select('created_at').eq('id', user_id).single().execute()
+        )
+        
+        if not result.data:
+            return None
+        
+        created_ts = datetime.fromisoformat(result.data['created_at'].replace('Z', '+00:00')).timestamp()
+        user_data_cache.set('account_created_at', created_ts, ttl=ACCOUNT_CREATED_TTL, user_id=user_id)
+        return created_ts
+    
+    async def get_user_account_age_days(self, user_id: str) -> Optional[int]:
         """
         Get user account age in days.
         
@@ -56,12 +111,10 @@ class ListeningHistoryService:
             Account age in days, or None if error
         """
         try:
-            result = self.supabase.supabase.table('profiles').select('created_at').eq('id', user_id).single().execute()
+            created_ts = await self._get_account_created_ts(user_id)
             
-            if result.data:
-                created_at = datetime.fromisoformat(result.data['created_at'].replace('Z', '+00:00'))
-                age_days = (datetime.now(created_at.tzinfo) - created_at).days
-                return age_days
+            if created_ts is not None:
+                return int((time.time() - created_ts) // SECONDS_PER_DAY)
             
             return None
             
@@ -86,7 +139,7 @@ class ListeningHistoryService:
         else:
             return 'month_2_plus'
     
-    def get_recommendation_weights(self, user_id: str, account_age_days: Optional[int] = None) -> Dict[str, float]:
+    async def get_recommendation_weights(self, user_id: str, account_age_days: Optional[int] = None) -> Dict[str, float]:
         """
         Get dynamic recommendation weights based on user account age (cold start strategy).
         
@@ -99,7 +152,7 @@ class ListeningHistoryService:
         """
         try:
             if account_age_days is None:
-                account_age_days = self.get_user_account_age_days(user_id)
+                account_age_days = await self.get_user_account_age_days(user_id)
             
             if account_age_days is None:
                 # Default to mature user weights
@@ -123,7 +176,8 @@ class ListeningHistoryService:
         self, 
         user_id: str, 
         spotify_token: str,
-        limit: int = 50
+        limit: int = 50,
+        agent: Optional[MusicIntelligenceAgent] = None
     ) -> List[Dict[str, Any]]:
         """
         Fetch user's top tracks from Spotify and store in listening_history table.
@@ -132,13 +186,15 @@ class ListeningHistoryService:
             user_id: User ID
             spotify_token: Spotify OAuth token
             limit: Number of tracks to fetch (spec: 50)
+            agent: Existing music agent for this user/token (created if omitted)
             
         Returns:
             List of stored listening history entries
         """
         try:
-            # Initialize music agent with Spotify token
-            agent = MusicIntelligenceAgent(user_id=user_id, spotify_token=spotify_token)
+            # Initialize music agent with Spotify token unless the caller shares one
+            if agent is None:
+                agent = MusicIntelligenceAgent(user_id=user_id, spotify_token=spotify_token)
             
             # Fetch top tracks (medium_term = ~6 months)
             logger.info(f"Fetching top {limit} tracks for user {user_id}")
@@ -151,12 +207,20 @@ class ListeningHistoryService:
             # Limit to requested number
             top_tracks = top_tracks[:limit]
             
-            # Get audio features for tracks
+            # Get audio features for tracks, reusing features already stored
+            # in listening_history and only requesting the missing subset
             track_ids = [track['id'] for track in top_tracks]
-            audio_features = await agent._get_audio_features(track_ids)
+            audio_features = await self._get_stored_audio_features(track_ids)
+            missing_ids = [track_id for track_id in track_ids if track_id not in audio_features]
             
-            # Store in database
+            if missing_ids:
+                audio_features.update(await agent._get_audio_features(missing_ids))
+            else:
+                logger.info(f"All {len(track_ids)} tracks already have stored audio features")
+            
+            # Store in database (one played_at timestamp for the whole refresh)
             stored_entries = []
+            played_at = datetime.utcnow().isoformat()
             
             for track in top_tracks:
                 track_id = track['id']
@@ -174,24 +238,26 @@ class ListeningHistoryService:
                     'duration_ms': track.get('duration_ms'),
                     'popularity': track.get('popularity'),
                     'explicit': track.get('explicit', False),
-                    'played_at': datetime.utcnow().isoformat(),
+                    'played_at': played_at,
                     **track_features  # Add audio features
                 }
                 
                 # Upsert using database function
                 try:
-                    result = self.supabase.supabase.rpc(
-                        'upsert_listening_history',
-                        {
-                            'p_user_id': user_id,
-                            'p_track_id': track_id,
-                            'p_track_name': track['name'],
-                            'p_artist_name': history_data['artist_name'],
-                            'p_played_at': history_data['played_at'],
-                            'p_audio_features': track_features,
-                            'p_duration_ms': track.get('duration_ms')
-                        }
-                    ).execute()
+                    result = await self._supa(
+                        lambda: self.supabase.supabase.rpc(
+                            'upsert_listening_history',
+                            {
+                                'p_user_id': user_id,
+                                'p_track_id': track_id,
+                                'p_track_name': track['name'],
+                                'p_artist_name': history_data['artist_name'],
+                                'p_played_at': history_data['played_at'],
+                                'p_audio_features': track_features,
+                                'p_duration_ms': track.get('duration_ms')
+                            }
+                        ).execute()
+                    )
                     
                     stored_entries.append(history_data)
                     
@@ -206,6 +272,38 @@ class ListeningHistoryService:
             logger.error(f"Error fetching and storing listening history: {e}")
             return []
     
+    async def _get_stored_audio_features(self, track_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up audio features already stored in listening_history.
+        
+        Args:
+            track_ids: Spotify track IDs
+            
+        Returns:
+            Mapping of track_id to audio features for tracks with stored features
+        """
+        if not track_ids:
+            return {}
+        
+        try:
+            # One row per track with features, deduplicated across users in
+            # Postgres, so the response is bounded by len(track_ids)
+            result = await self._supa(
+                lambda: self.supabase.supabase.rpc(
+                    'get_stored_audio_features',
+                    {'p_track_ids': track_ids}
+                ).execute()
+            )
+            
+            return {
+                row['track_id']: {k: row[k] for k in AUDIO_FEATURE_KEYS if row.get(k) is not None}
+                for row in result.data or []
+            }
+            
+        except Exception as e:
+            logger.warning(f"Error reading stored audio features: {e}")
+            return {}
+    
     async def get_user_top_50_tracks(self, user_id: str) -> List[Dict[str, Any]]:
         """
         Get user's top 50 tracks from listening_history table.
@@ -217,10 +315,12 @@ class ListeningHistoryService:
             List of top 50 tracks with audio features
         """
         try:
-            result = self.supabase.supabase.rpc(
-                'get_user_top_50_tracks',
-                {'p_user_id': user_id}
-            ).execute()
+            result = await self._supa(
+                lambda: self.supabase.supabase.rpc(
+                    'get_user_top_50_tracks',
+                    {'p_user_id': user_id}
+                ).execute()
+            )
             
             if result.data:
                 logger.info(f"Retrieved {len(result.data)} tracks from listening history for user {user_id}")
@@ -236,7 +336,8 @@ class ListeningHistoryService:
         self, 
         user_id: str, 
         spotify_token: str,
-        force: bool = False
+        force: bool = False,
+        agent: Optional[MusicIntelligenceAgent] = None
     ) -> bool:
         """
         Refresh listening history if needed.
@@ -245,6 +346,7 @@ class ListeningHistoryService:
             user_id: User ID
             spotify_token: Spotify OAuth token
             force: Force refresh regardless of last update
+            agent: Existing music agent for this user/token (created if omitted)
             
         Returns:
             True if refreshed successfully
@@ -252,12 +354,14 @@ class ListeningHistoryService:
         try:
             # Check last update time
             if not force:
-                result = self.supabase.supabase.table('listening_history') \
-                    .select('updated_at') \
-                    .eq('user_id', user_id) \
-                    .order('updated_at', desc=True) \
-                    .limit(1) \
+                result = await self._supa(
+                    lambda: self.supabase.supabase.table('listening_history')
+                    .select('updated_at')
+                    .eq('user_id', user_id)
+                    .order('updated_at', desc=True)
+                    .limit(1)
                     .execute()
+                )
                 
                 if result.data:
                     last_update = datetime.fromisoformat(result.data[0]['updated_at'].replace('Z', '+00:00'))
@@ -269,7 +373,7 @@ class ListeningHistoryService:
                         return True
             
             # Fetch and store fresh data
-            await self.fetch_and_store_listening_history(user_id, spotify_token)
+            await self.fetch_and_store_listening_history(user_id, spotify_token, agent=agent)
             
             return True
             
@@ -289,11 +393,13 @@ class ListeningHistoryService:
         """
         try:
             # Get popular tracks from all users' listening history
-            result = self.supabase.supabase.table('listening_history') \
-                .select('*') \
-                .order('popularity', desc=True) \
-                .limit(limit) \
+            result = await self._supa(
+                lambda: self.supabase.supabase.table('listening_history')
+                .select('*')
+                .order('popularity', desc=True, nullsfirst=False)
+                .limit(limit)
                 .execute()
+            )
             
             if result.data:
                 # Deduplicate by track_id
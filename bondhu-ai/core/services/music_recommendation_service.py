@@ -11,19 +11,27 @@ Ties together all components per spec:
 
 import asyncio
 import time
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+import weakref
+from typing import Dict, List, Any, Optional, Callable
+from datetime import datetime
 import logging
 
 from core.database.supabase_client import get_supabase_client
 from core.database.models import PersonalityTrait
 from core.services.listening_history_service import listening_history_service
 from core.services.recommendation_scorer import recommendation_scorer
-from core.services.redis_cache import recommendations_cache, RECOMMENDATIONS_TTL
+from core.services.redis_cache import async_recommendations_cache, RECOMMENDATIONS_TTL
 from agents.music.music_agent import MusicIntelligenceAgent
 
 logger = logging.getLogger("bondhu.music_recommendation_service")
 
+# Single-flight lock guarding recomputation after a recommendations cache miss.
+# The TTL only bounds how long a crashed holder blocks others: a live holder
+# renews it every RECOMPUTE_LOCK_RENEW_INTERVAL for as long as the build runs.
+RECOMPUTE_LOCK_TTL = 30  # seconds
+RECOMPUTE_LOCK_RENEW_INTERVAL = RECOMPUTE_LOCK_TTL / 3
+RECOMPUTE_POLL_MAX_DELAY = 2.0  # seconds
+
 
 class MusicRecommendationService:
     """
@@ -34,8 +42,23 @@ class MusicRecommendationService:
     def __init__(self):
         """Initialize music recommendation service."""
         self.supabase = get_supabase_client()
+        # Per-user locks, dropped automatically once no coroutine holds them
+        self._user_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
         logger.info("MusicRecommendationService initialized")
     
+    async def _supa(self, fn: Callable[[], Any]) -> Any:
+        """
+        Run a blocking Supabase call in a worker thread so concurrent
+        requests are not serialized behind the synchronous client.
+        
+        Args:
+            fn: Zero-argument callable performing the query (ending in .execute())
+            
+        Returns:
+            Query result
+        """
+        return await asyncio.to_thread(fn)
+    
     async def get_personality_profile(self, user_id: str) -> Dict[PersonalityTrait, float]:
         """
         Get user's personality profile from database.
@@ -47,10 +70,12 @@ class MusicRecommendationService:
             Dict mapping PersonalityTrait to score (0-1 scale)
         """
         try:
-            result = self.supabase.supabase.rpc(
-                'get_active_personality_profile',
-                {'p_user_id': user_id}
-            ).execute()
+            result = await self._supa(
+                lambda: self.supabase.supabase.rpc(
+                    'get_active_personality_profile',
+                    {'p_user_id': user_id}
+                ).execute()
+            )
             
             if result.data and len(result.data) > 0:
                 profile_data = result.data[0]
@@ -84,7 +109,8 @@ class MusicRecommendationService:
         spotify_token: Optional[str],
         personality_profile: Dict[PersonalityTrait, float],
         listening_history: List[Dict[str, Any]],
-        target_count: int = 300
+        target_count: int = 300,
+        agent: Optional[MusicIntelligenceAgent] = None
     ) -> List[Dict[str, Any]]:
         """
         Generate 200-500 candidate tracks from various sources.
@@ -95,6 +121,7 @@ class MusicRecommendationService:
             personality_profile: User's personality scores
             listening_history: User's top 50 tracks
             target_count: Target number of candidates (spec: 200-500)
+            agent: Existing music agent for this user/token (created if omitted)
             
         Returns:
             List of candidate tracks with audio features
@@ -103,14 +130,15 @@ class MusicRecommendationService:
         
         try:
             # Get cold start stage and weights
-            cold_start_weights = listening_history_service.get_recommendation_weights(user_id)
+            cold_start_weights = await listening_history_service.get_recommendation_weights(user_id)
             stage = cold_start_weights.get('stage', 'month_2_plus')
             
             logger.info(f"Generating {target_count} candidates for user {user_id} (stage: {stage})")
             
             if spotify_token:
-                # Initialize music agent
-                agent = MusicIntelligenceAgent(user_id=user_id, spotify_token=spotify_token)
+                # Initialize music agent unless the caller shares one
+                if agent is None:
+                    agent = MusicIntelligenceAgent(user_id=user_id, spotify_token=spotify_token)
                 
                 # Source 1: Spotify recommendations based on top tracks (if available)
                 if listening_history and stage != 'week_1':
@@ -155,15 +183,13 @@ class MusicRecommendationService:
                 )
                 candidates.extend(popular_tracks)
             
-            # Deduplicate by track_id
-            seen_ids = set()
-            unique_candidates = []
-            
+            # Deduplicate by track_id (dicts preserve insertion order, first occurrence wins)
+            by_id = {}
             for candidate in candidates:
                 track_id = candidate.get('track_id') or candidate.get('id')
-                if track_id and track_id not in seen_ids:
-                    seen_ids.add(track_id)
-                    unique_candidates.append(candidate)
+                if track_id and track_id not in by_id:
+                    by_id[track_id] = candidate
+            unique_candidates = list(by_id.values())
             
             logger.info(f"Generated {len(unique_candidates)} unique candidates for user {user_id}")
             
@@ -206,21 +232,135 @@ class MusicRecommendationService:
         """
         start_time = time.time()
         
-        try:
-            # Step 1: Check cache (unless force refresh)
+        # Step 1: Check cache (unless force refresh)
+        if not force_refresh:
+            cached = await self._load_cached_recommendations(user_id, start_time)
+            if cached:
+                return cached
+        
+        # Single-flight: when the cache entry expires only one coroutine per
+        # user recomputes, the others wait for and reuse its result
+        async with self._get_user_lock(user_id):
             if not force_refresh:
-                cached = recommendations_cache.get(f'recommendations_{user_id}', user_id=user_id)
+                cached = await self._load_cached_recommendations(user_id, start_time)
                 if cached:
-                    logger.info(f"Returning cached recommendations for user {user_id}")
-                    cached['from_cache'] = True
-                    cached['response_time_ms'] = int((time.time() - start_time) * 1000)
                     return cached
             
+            # Cross-process lock so other workers don't recompute concurrently
+            lock_key = f'recommendations_lock_{user_id}'
+            lock_token = await async_recommendations_cache.acquire_lock(
+                lock_key,
+                ttl=RECOMPUTE_LOCK_TTL,
+                user_id=user_id
+            )
+            
+            if not lock_token and not force_refresh:
+                cached = await self._wait_for_cached_recommendations(user_id, start_time)
+                if cached:
+                    return cached
+            
+            renewal = asyncio.create_task(self._renew_recompute_lock(user_id, lock_token)) if lock_token else None
+            try:
+                return await self._build_recommendations(user_id, spotify_token, max_results, start_time)
+            finally:
+                if lock_token:
+                    renewal.cancel()
+                    await async_recommendations_cache.release_lock(lock_key, lock_token, user_id=user_id)
+    
+    async def _renew_recompute_lock(self, user_id: str, lock_token: str) -> None:
+        """
+        Keep the recompute lock alive while this worker builds recommendations.
+        
+        Args:
+            user_id: User ID
+            lock_token: Owner token returned by acquire_lock
+        """
+        while True:
+            await asyncio.sleep(RECOMPUTE_LOCK_RENEW_INTERVAL)
+            extended = await async_recommendations_cache.extend_lock(
+                f'recommendations_lock_{user_id}',
+                lock_token,
+                ttl=RECOMPUTE_LOCK_TTL,
+                user_id=user_id
+            )
+            if not extended:
+                logger.warning(f"Lost recommendations recompute lock for user {user_id}")
+                return
+    
+    def _get_user_lock(self, user_id: str) -> asyncio.Lock:
+        """Get the in-process recompute lock for a user."""
+        lock = self._user_locks.get(user_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._user_locks[user_id] = lock
+        return lock
+    
+    async def _load_cached_recommendations(self, user_id: str, start_time: float) -> Optional[Dict[str, Any]]:
+        """Return cached recommendations for user, or None on cache miss."""
+        cached = await async_recommendations_cache.get(f'recommendations_{user_id}', user_id=user_id)
+        if cached:
+            logger.info(f"Returning cached recommendations for user {user_id}")
+            cached['from_cache'] = True
+            cached['response_time_ms'] = int((time.time() - start_time) * 1000)
+            return cached
+        return None
+    
+    async def _wait_for_cached_recommendations(self, user_id: str, start_time: float) -> Optional[Dict[str, Any]]:
+        """
+        Poll the cache while another worker recomputes recommendations.
+        
+        Args:
+            user_id: User ID
+            start_time: Request start time (for response_time_ms)
+            
+        Returns:
+            Freshly cached recommendations, or None if the lock holder
+            released (or stopped renewing) the lock without caching a result
+        """
+        delay = 0.1
+        
+        # Wait exactly as long as the lock is held, however long the build takes
+        while await async_recommendations_cache.exists(f'recommendations_lock_{user_id}', user_id=user_id):
+            await asyncio.sleep(delay)
+            cached = await self._load_cached_recommendations(user_id, start_time)
+            if cached:
+                return cached
+            delay = min(delay * 2, RECOMPUTE_POLL_MAX_DELAY)
+        
+        # The holder may have cached its result just before releasing
+        cached = await self._load_cached_recommendations(user_id, start_time)
+        if not cached:
+            logger.warning(f"Recommendations recompute for user {user_id} ended without a cached result")
+        return cached
+    
+    async def _build_recommendations(
+        self,
+        user_id: str,
+        spotify_token: Optional[str],
+        max_results: int,
+        start_time: float
+    ) -> Dict[str, Any]:
+        """
+        Run the full recommendation pipeline (steps 2-6) and cache the result.
+        
+        Args:
+            user_id: User ID
+            spotify_token: Spotify OAuth token
+            max_results: Number of recommendations (spec: 50)
+            start_time: Request start time (for response_time_ms)
+            
+        Returns:
+            Dict with recommendations and metadata
+        """
+        try:
+            # One agent per request, shared by the refresh and candidate generation
+            agent = MusicIntelligenceAgent(user_id=user_id, spotify_token=spotify_token) if spotify_token else None
+            
             # Step 2: Fetch listening history
             listening_history = []
             if spotify_token:
                 # Refresh from Spotify
-                await listening_history_service.refresh_listening_history(user_id, spotify_token)
+                await listening_history_service.refresh_listening_history(user_id, spotify_token, agent=agent)
             
             # Get from database
             listening_history = await listening_history_service.get_user_top_50_tracks(user_id)
@@ -234,7 +374,8 @@ class MusicRecommendationService:
                 spotify_token,
                 personality_profile,
                 listening_history,
-                target_count=300
+                target_count=300,
+                agent=agent
             )
             
             if not candidates:
@@ -246,8 +387,10 @@ class MusicRecommendationService:
                     'total_count': 0
                 }
             
-            # Step 5: Score and rank candidates
-            scored_recommendations = recommendation_scorer.rank_candidates(
+            # Step 5: Score and rank candidates on the scorer thread, so the
+            # batched numpy work (feature matrices built once inside) doesn't
+            # stall the event loop
+            scored_recommendations = await recommendation_scorer.rank_candidates_async(
                 candidates,
                 listening_history,
                 personality_profile,
@@ -264,7 +407,7 @@ class MusicRecommendationService:
                 })
             
             # Get cold start info
-            cold_start_weights = listening_history_service.get_recommendation_weights(user_id)
+            cold_start_weights = await listening_history_service.get_recommendation_weights(user_id)
             
             # Build response
             response_time_ms = int((time.time() - start_time) * 1000)
@@ -290,7 +433,7 @@ class MusicRecommendationService:
             }
             
             # Step 6: Cache result (24h TTL)
-            recommendations_cache.set(
+            await async_recommendations_cache.set(
                 f'recommendations_{user_id}',
                 result,
                 ttl=RECOMMENDATIONS_TTL,
@@ -311,14 +454,15 @@ class MusicRecommendationService:
                     'recommendation_type': 'standard' if cold_start_weights.get('stage') == 'month_2_plus' else 'cold_start',
                     'total_candidates': len(candidates),
                     'final_count': len(recommendations),
-                    'generated_at': datetime.utcnow().isoformat(),
-                    'expires_at': (datetime.utcnow() + timedelta(hours=24)).isoformat(),
+                    # generated_at / expires_at come from column defaults (now(), now() + 24h)
                     'user_account_age_days': cold_start_weights.get('account_age_days'),
                     'personality_snapshot': {trait.value: score for trait, score in personality_profile.items()},
                     'listening_history_size': len(listening_history)
                 }
                 
-                self.supabase.supabase.table('recommendations_cache').insert(cache_data).execute()
+                await self._supa(
+                    lambda: self.supabase.supabase.table('recommendations_cache').insert(cache_data).execute()
+                )
             except Exception as cache_error:
                 logger.warning(f"Failed to store in recommendations_cache table: {cache_error}")
             
@@ -4,21 +4,160 @@ Handles rate limiting for Spotify API and other services to ensure we stay withi
 Updated to support 500-1000 concurrent users with user-level rate limiting (100 req/min per user).
 """
 
+import math
+import random
 import time
+import heapq
+import itertools
 import asyncio
-from typing import Dict, Any, Optional, Callable
-from collections import defaultdict, deque
+from typing import Dict, Any, Optional, Callable, List, Tuple, Hashable
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache, partial
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timedelta
 import logging
+import weakref
 
 logger = logging.getLogger(__name__)
 
+# Per-user sliding window hash keys in Redis
+USER_RATE_LIMIT_KEY_PREFIX = "user_rate_limit_sw:"
+
+
+@lru_cache(maxsize=2048)
+def _rl_key(user_id: str) -> str:
+    """Redis key for a user's rate limit window (memoized for the active user set)."""
+    return f"{USER_RATE_LIMIT_KEY_PREFIX}{user_id}"
+
+
+@lru_cache(maxsize=256)
+def _is_coro_function(func: Callable) -> bool:
+    """Whether func is a coroutine function (cached per function object)."""
+    return asyncio.iscoroutinefunction(func)
+
+
+def _is_coro(func: Callable) -> bool:
+    """
+    Whether func is a coroutine function.
+    Bound methods are looked up by their underlying function, so the cache
+    never keeps API client instances alive.
+    """
+    return _is_coro_function(getattr(func, '__func__', func))
+
+
+# Bound once; the token bucket hot path calls it on every acquire
+_monotonic = time.monotonic
+
+# In-memory user window for users with no tracked requests: (packed counts, window index)
+_EMPTY_WINDOW: Tuple[int, Optional[int]] = (0, None)
+
+# GCRA comparisons allow this much float rounding, so a token due "now" is granted
+GCRA_EPSILON = 1e-9
+
+# Shortest sleep between acquire attempts, so rounding never turns a wait into a spin
+MIN_ACQUIRE_WAIT = 0.001
+
+# Low 32 bits of a packed in-memory window hold the current window's count
+COUNT_MASK = 0xFFFFFFFF
+
+# Retry policy for rate_limited_call: backoff cap and overall time budget (seconds)
+RETRY_BACKOFF_CAP = 30.0
+RATE_LIMITED_CALL_TIMEOUT = 120.0
+
+# Worker threads for blocking (spotipy) calls made through rate_limited_call
+SPOTIFY_IO_WORKERS = 64
+_spotify_executor = ThreadPoolExecutor(max_workers=SPOTIFY_IO_WORKERS, thread_name_prefix="spotify-io")
+
+# Sliding window counter (current + previous fixed window, weighted by overlap).
+# KEYS[1] = per-user hash, KEYS[2] = active-users zset,
+# ARGV = {now, window_seconds, limit, user_id, fallback_ttl}
+# Returns {allowed (1/0), retry_after_seconds}
+# Idle users are removed in batches by SWEEP_IDLE_USERS_LUA; the hash TTL is only
+# a long fallback in case the sweep isn't running, refreshed when the window rolls.
+SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+local current_window = math.floor(now / window)
+local state = redis.call('HMGET', key, 'cw', 'count', 'prev_count')
+local cw = tonumber(state[1])
+local count = tonumber(state[2]) or 0
+local prev = tonumber(state[3]) or 0
+local rolled = cw ~= current_window
+
+if rolled then
+    if cw == current_window - 1 then
+        prev = count
+    else
+        prev = 0
+    end
+    count = 0
+end
+
+local elapsed = now - current_window * window
+local weighted = prev * (window - elapsed) / window + count
+
+if weighted >= limit then
+    local retry
+    if prev > 0 and count < limit then
+        retry = window * (1 - (limit - count) / prev) - elapsed
+    else
+        retry = window - elapsed
+    end
+    return {0, math.max(1, math.ceil(retry))}
+end
+
+redis.call('HSET', key, 'cw', current_window, 'count', count + 1, 'prev_count', prev)
+if rolled then
+    redis.call('EXPIRE', key, ARGV[5])
+end
+redis.call('ZADD', KEYS[2], now, ARGV[4])
+return {1, 0}
+"""
+
+# Cleanup of a batch of idle users' windows. Candidates are read from the zset
+# by the caller; the script re-checks each one atomically, so a user who became
+# active since is never deleted.
+# KEYS[1] = active-users zset, KEYS[2..n] = candidates' window hashes,
+# ARGV = {idle_cutoff, candidate user ids in KEYS order}
+# Returns number of users removed
+SWEEP_IDLE_USERS_LUA = """
+local cutoff = tonumber(ARGV[1])
+local removed = 0
+
+for i = 2, #KEYS do
+    local last_seen = tonumber(redis.call('ZSCORE', KEYS[1], ARGV[i]))
+    if last_seen and last_seen <= cutoff then
+        redis.call('DEL', KEYS[i])
+        redis.call('ZREM', KEYS[1], ARGV[i])
+        removed = removed + 1
+    end
+end
+return removed
+"""
+
 class RateLimiter:
     """
     Token bucket rate limiter with burst capacity.
     Suitable for API rate limiting with different tiers.
+    
+    Implemented as a GCRA ("allowed at" timestamp) bucket: instead of a token
+    count that has to be refilled, it tracks the theoretical arrival time of the
+    next request on the monotonic clock. A request is allowed while that time is
+    no more than one burst ahead of now, so each acquire is a single timestamp
+    update and wall-clock jumps cannot mint or swallow tokens.
     """
     
+    # Fixed attribute layout: the acquire hot path is attribute reads and float math
+    __slots__ = (
+        "requests_per_second", "burst_capacity", "window_size",
+        "_interval", "_burst_window", "_burst_slack", "_next_available", "_conds",
+        "_buckets", "_bucket_epoch", "_recent_requests",
+        "total_requests", "rejected_requests", "_current_rate",
+    )
+    
     def __init__(
         self, 
         requests_per_second: float = 1.0,
@@ -37,14 +176,50 @@ class RateLimiter:
         self.burst_capacity = burst_capacity
         self.window_size = window_size
         
-        # Token bucket state
-        self.tokens = burst_capacity
-        self.last_refill = time.time()
+        # GCRA state: emission interval, burst allowance and theoretical arrival time
+        self._interval = 1.0 / requests_per_second
+        self._burst_window = burst_capacity * self._interval
+        # How far the arrival time may run ahead of now and still admit a request
+        self._burst_slack = self._burst_window - self._interval
+        self._next_available = time.monotonic()  # starts with a full burst available
+        
+        # Waiters sleep on a condition until a token is due or returned. asyncio
+        # primitives are bound to one event loop, so there is one per loop
+        # (e.g. successive asyncio.run calls sharing a module-level limiter)
+        self._conds: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Condition]" = (
+            weakref.WeakKeyDictionary()
+        )
         
-        # Request tracking for analytics
-        self.request_times = deque()
+        # Request tracking for analytics: ring of per-second request counts over
+        # the window, plus their running total
+        self._buckets = [0] * max(1, window_size)
+        self._bucket_epoch = int(time.monotonic())  # second the newest bucket covers
+        self._recent_requests = 0
         self.total_requests = 0
         self.rejected_requests = 0
+        self._current_rate = 0.0
+    
+    def _condition(self) -> asyncio.Condition:
+        """Condition for the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        cond = self._conds.get(loop)
+        if cond is None:
+            # A used condition references its loop, so entries for closed
+            # loops are dropped here rather than by the weak keys
+            for closed_loop in [other for other in self._conds if other.is_closed()]:
+                del self._conds[closed_loop]
+            cond = self._conds[loop] = asyncio.Condition()
+        return cond
+    
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available (derived from the arrival timestamp)."""
+        return self._tokens_at(_monotonic())
+    
+    def _tokens_at(self, now: float) -> float:
+        """Tokens available at monotonic time now."""
+        backlog = max(self._next_available, now) - now
+        return (self._burst_window - backlog) / self._interval
         
     async def acquire(self, timeout: float = 30.0) -> bool:
         """
@@ -56,58 +231,140 @@ class RateLimiter:
         Returns:
             True if permission granted, False if timeout
         """
-        start_time = time.time()
+        # Uncontended fast path: no lock, just the timestamp update
+        now = _monotonic()
+        if self._try_acquire_nowait(now):
+            self._record_request(now)
+            return True
         
-        while time.time() - start_time < timeout:
-            self._refill_tokens()
-            
-            if self.tokens >= 1:
-                self.tokens -= 1
-                self._record_request()
-                return True
-            
-            # Calculate wait time until next token
-            wait_time = 1.0 / self.requests_per_second
-            await asyncio.sleep(min(wait_time, 0.1))
+        deadline = now + timeout
+        cond = self._condition()
+        
+        async with cond:
+            while True:
+                now = _monotonic()
+                if self._try_acquire_nowait(now):
+                    self._record_request(now)
+                    return True
+                
+                # Exact time until the next token, rather than fixed-interval polling
+                wait_time = max(self.next_token_eta(now), MIN_ACQUIRE_WAIT)
+                if now + wait_time > deadline:
+                    break
+                
+                # Condition.wait releases the lock while sleeping, so other
+                # waiters and refunds are never blocked behind this one
+                try:
+                    await asyncio.wait_for(cond.wait(), timeout=wait_time)
+                except asyncio.TimeoutError:
+                    pass
         
         self.rejected_requests += 1
         logger.warning(f"Rate limit timeout after {timeout}s")
         return False
     
-    def _refill_tokens(self):
-        """Refill tokens based on elapsed time."""
-        now = time.time()
-        elapsed = now - self.last_refill
+    async def release(self):
+        """
+        Return an unused token to the bucket (capped at burst capacity)
+        and wake one waiter.
+        """
+        cond = self._condition()
+        async with cond:
+            self._next_available = max(self._next_available - self._interval, _monotonic())
+            cond.notify(1)
+    
+    def _try_acquire_nowait(self, now: Optional[float] = None) -> bool:
+        """
+        Take a token if one is available right now, without waiting.
+        Does not record the request; callers record once the call is admitted.
+        
+        Args:
+            now: Monotonic timestamp already read by the caller
+            
+        Returns:
+            True if a token was taken
+        """
+        if now is None:
+            now = _monotonic()
+        next_available = self._next_available
+        if next_available < now:
+            next_available = now
+        
+        if next_available - now <= self._burst_slack + GCRA_EPSILON:
+            self._next_available = next_available + self._interval
+            return True
         
-        # Add tokens based on rate
-        tokens_to_add = elapsed * self.requests_per_second
-        self.tokens = min(self.burst_capacity, self.tokens + tokens_to_add)
-        self.last_refill = now
+        return False
     
-    def _record_request(self):
-        """Record request for analytics."""
-        now = time.time()
-        self.request_times.append(now)
+    def next_token_eta(self, now: Optional[float] = None) -> float:
+        """Seconds until a token becomes available (0 if one is available now)."""
+        if now is None:
+            now = _monotonic()
+        return max(0.0, max(self._next_available, now) - now - self._burst_slack)
+    
+    def _record_request(self, now: Optional[float] = None):
+        """Record request for analytics (at the caller's monotonic timestamp if given)."""
+        if now is None:
+            now = _monotonic()
+        second = int(now)
+        
+        self._advance_buckets(second)
+        self._buckets[second % len(self._buckets)] += 1
+        self._recent_requests += 1
         self.total_requests += 1
         
-        # Clean old entries
-        cutoff = now - self.window_size
-        while self.request_times and self.request_times[0] < cutoff:
-            self.request_times.popleft()
+        # Keep the windowed rate current so stats scrapes don't recompute it
+        self._current_rate = self._recent_requests / self.window_size if self.window_size > 0 else 0
     
-    def get_stats(self) -> Dict[str, Any]:
-        """Get rate limiter statistics."""
-        now = time.time()
-        recent_requests = len(self.request_times)
+    def _advance_buckets(self, second: int):
+        """
+        Move the ring forward to the given second, zeroing buckets that fell
+        out of the window.
+        
+        Args:
+            second: Current monotonic time in whole seconds
+        """
+        buckets = self._buckets
+        size = len(buckets)
+        elapsed = second - self._bucket_epoch
+        if elapsed <= 0:
+            return
+        
+        if elapsed >= size:
+            # Whole window expired
+            buckets[:] = [0] * size
+            self._recent_requests = 0
+        else:
+            for elapsed_second in range(self._bucket_epoch + 1, second + 1):
+                idx = elapsed_second % size
+                self._recent_requests -= buckets[idx]
+                buckets[idx] = 0
+        
+        self._bucket_epoch = second
+    
+    def get_stats(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get rate limiter statistics.
+        
+        Args:
+            now: Monotonic timestamp to evaluate at (read once by callers
+                collecting stats for several limiters)
+        """
+        if now is None:
+            now = _monotonic()
+        
+        self._advance_buckets(int(now))
+        recent_requests = self._recent_requests
+        self._current_rate = recent_requests / self.window_size if self.window_size > 0 else 0
         
         return {
             "requests_per_second_limit": self.requests_per_second,
             "burst_capacity": self.burst_capacity,
-            "current_tokens": self.tokens,
+            "current_tokens": self._tokens_at(now),
             "total_requests": self.total_requests,
             "rejected_requests": self.rejected_requests,
             "recent_requests": recent_requests,
-            "current_rate": recent_requests / self.window_size if self.window_size > 0 else 0,
+            "current_rate": self._current_rate,
             "rejection_rate": self.rejected_requests / max(1, self.total_requests)
         }
 
@@ -131,23 +388,36 @@ class SpotifyRateLimiter:
     
     def __init__(self):
         """Initialize Spotify rate limiter with endpoint-specific limits."""
-        self.limiters = {}
+        # Endpoint limiters are created on first use; most endpoints are rarely hit
+        self._configs = self.ENDPOINT_LIMITS
+        self.limiters: Dict[str, RateLimiter] = {}
         
-        for endpoint, config in self.ENDPOINT_LIMITS.items():
-            self.limiters[endpoint] = RateLimiter(
-                requests_per_second=config["requests_per_second"],
-                burst_capacity=config["burst"],
-                window_size=60
-            )
-        
-        # Global limiter for overall API usage
-        self.global_limiter = RateLimiter(
+        logger.info("Spotify rate limiter initialized")
+    
+    @cached_property
+    def global_limiter(self) -> RateLimiter:
+        """Global limiter for overall API usage."""
+        return RateLimiter(
             requests_per_second=20.0,  # Conservative global limit
             burst_capacity=50,
             window_size=60
         )
+    
+    def _get_limiter(self, endpoint: str) -> RateLimiter:
+        """Get (or lazily create) the limiter for an endpoint; unknown endpoints share 'tracks'."""
+        if endpoint not in self._configs:
+            endpoint = "tracks"
         
-        logger.info("Spotify rate limiter initialized")
+        limiter = self.limiters.get(endpoint)
+        if limiter is None:
+            config = self._configs[endpoint]
+            limiter = self.limiters[endpoint] = RateLimiter(
+                requests_per_second=config["requests_per_second"],
+                burst_capacity=config["burst"],
+                window_size=60
+            )
+        
+        return limiter
     
     async def acquire_for_endpoint(self, endpoint: str, timeout: float = 30.0) -> bool:
         """
@@ -160,13 +430,38 @@ class SpotifyRateLimiter:
         Returns:
             True if permission granted
         """
-        # Check global limit first
-        if not await self.global_limiter.acquire(timeout=timeout/2):
-            return False
+        limiter = self._get_limiter(endpoint)
+        global_limiter = self.global_limiter
+        deadline = _monotonic() + timeout
         
-        # Check endpoint-specific limit
-        limiter = self.limiters.get(endpoint, self.limiters["tracks"])
-        return await limiter.acquire(timeout=timeout/2)
+        while True:
+            # One clock read per attempt, shared by both buckets and the analytics
+            now = _monotonic()
+            
+            # Take both tokens or neither, so a global token is never burned
+            # while the endpoint bucket is empty
+            if global_limiter._try_acquire_nowait(now):
+                if limiter._try_acquire_nowait(now):
+                    global_limiter._record_request(now)
+                    limiter._record_request(now)
+                    return True
+                
+                await global_limiter.release()
+            
+            # Both buckets must have a token, so wait for the slower one
+            wait_time = max(global_limiter.next_token_eta(now), limiter.next_token_eta(now), MIN_ACQUIRE_WAIT)
+            if now + wait_time > deadline:
+                break
+            
+            await asyncio.sleep(wait_time)
+        
+        now = _monotonic()
+        for blocking_limiter in (global_limiter, limiter):
+            if blocking_limiter.next_token_eta(now) > 0:
+                blocking_limiter.rejected_requests += 1
+        
+        logger.warning(f"Rate limit timeout for {endpoint} after {timeout}s")
+        return False
     
     async def rate_limited_call(
         self, 
@@ -174,6 +469,7 @@ class SpotifyRateLimiter:
         func: Callable, 
         *args, 
         max_retries: int = 3,
+        total_timeout: Optional[float] = RATE_LIMITED_CALL_TIMEOUT,
         **kwargs
     ) -> Any:
         """
@@ -183,12 +479,45 @@ class SpotifyRateLimiter:
             endpoint: API endpoint category
             func: Function to call
             max_retries: Maximum retry attempts
+            total_timeout: Overall time budget in seconds (None for no limit)
+            
+        Returns:
+            Function result or None if failed
+        """
+        try:
+            # Bound the whole call, including rate limit waits and backoff sleeps
+            async with asyncio.timeout(total_timeout):
+                return await self._call_with_retries(endpoint, func, args, kwargs, max_retries)
+        except TimeoutError:
+            logger.error(f"Gave up on {endpoint} after {total_timeout}s total")
+            return None
+    
+    async def _call_with_retries(
+        self,
+        endpoint: str,
+        func: Callable,
+        args: tuple,
+        kwargs: Dict[str, Any],
+        max_retries: int
+    ) -> Any:
+        """
+        Retry loop behind rate_limited_call.
+        
+        Args:
+            endpoint: API endpoint category
+            func: Function to call
+            args: Positional arguments for func
+            kwargs: Keyword arguments for func
+            max_retries: Maximum retry attempts
             
         Returns:
             Function result or None if failed
         """
         last_exception = None
         
+        # Invariant across retries, so inspect func once per call
+        is_coro = _is_coro(func)
+        
         for attempt in range(max_retries + 1):
             try:
                 # Acquire rate limit permission
@@ -197,42 +526,51 @@ class SpotifyRateLimiter:
                     return None
                 
                 # Make the API call
-                if asyncio.iscoroutinefunction(func):
+                if is_coro:
                     result = await func(*args, **kwargs)
                 else:
-                    result = await asyncio.to_thread(func, *args, **kwargs)
+                    # Dedicated pool: the default to_thread executor is capped at
+                    # min(32, cpu + 4) threads and would throttle before the limiter does
+                    result = await asyncio.get_running_loop().run_in_executor(
+                        _spotify_executor, partial(func, *args, **kwargs)
+                    )
                 
                 return result
                 
             except Exception as e:
                 last_exception = e
 
-                # Try to extract richer error details (status codes, response body) when available
-                status = None
-                resp_text = None
-                try:
-                    # spotipy.SpotifyException uses .http_status and .msg in some versions
-                    status = getattr(e, 'http_status', None) or getattr(e, 'status_code', None)
-                    # Some exceptions carry a response or msg attribute with content
-                    possible_resp = getattr(e, 'response', None) or getattr(e, 'msg', None)
-                    if possible_resp is not None:
-                        # If it's a requests.Response-like object
-                        if hasattr(possible_resp, 'text'):
-                            resp_text = possible_resp.text
-                        else:
-                            resp_text = str(possible_resp)
-                except Exception:
-                    # Best-effort only; don't fail on logging
-                    status = None
-                    resp_text = None
-
+                # Extract structured error details (status code, response) once
+                status = getattr(e, 'http_status', None) or getattr(e, 'status_code', None)
+                resp = getattr(e, 'response', None)
+                err_str = str(e)
+                
+                if status is not None:
+                    is_rate_limited = status == 429
+                else:
+                    # Only unstructured errors need a substring scan
+                    is_rate_limited = '429' in err_str or 'rate limit' in err_str.lower()
+                
                 # Check if it's a rate limit error and backoff if so
-                if status and str(status) == '429' or '429' in str(e) or 'rate limit' in str(e).lower():
-                    wait_time = (2 ** attempt) * 1.0  # Exponential backoff
-                    logger.warning(f"Rate limited on {endpoint}, waiting {wait_time}s (attempt {attempt + 1})")
+                if is_rate_limited:
+                    # Server-provided Retry-After, else capped exponential backoff with
+                    # jitter so concurrent callers don't retry in lockstep
+                    backoff = min(RETRY_BACKOFF_CAP, (2 ** attempt) * random.uniform(0.5, 1.5))
+                    wait_time = self._retry_after(e, resp, default=backoff)
+                    logger.warning(f"Rate limited on {endpoint}, waiting {wait_time:.2f}s (attempt {attempt + 1})")
                     await asyncio.sleep(wait_time)
                     continue
 
+                # spotipy.SpotifyException carries the body in .msg, others may carry a response
+                resp_text = None
+                possible_resp = resp if resp is not None else getattr(e, 'msg', None)
+                if possible_resp is not None:
+                    # If it's a requests.Response-like object
+                    if hasattr(possible_resp, 'text'):
+                        resp_text = possible_resp.text
+                    else:
+                        resp_text = str(possible_resp)
+
                 # For other errors, include richer context in logs and retry if attempts remain
                 extra = ''
                 if status:
@@ -242,100 +580,345 @@ class SpotifyRateLimiter:
                     truncated = (resp_text[:1000] + '...') if len(resp_text) > 1000 else resp_text
                     extra += f" response_body={truncated}"
 
-                logger.warning(f"API error on {endpoint}: {e}{extra} (attempt {attempt + 1})")
+                logger.warning(f"API error on {endpoint}: {err_str}{extra} (attempt {attempt + 1})")
                 if attempt < max_retries:
                     await asyncio.sleep(0.5 * (attempt + 1))
         
         logger.error(f"Failed {endpoint} after {max_retries + 1} attempts: {last_exception}")
         return None
     
+    @staticmethod
+    def _retry_after(error: Exception, resp: Any, default: float) -> float:
+        """
+        Get the server-requested backoff from a Retry-After header.
+        
+        Args:
+            error: Exception raised by the API call
+            resp: Response attached to the exception, if any
+            default: Backoff to use when no usable header is present
+            
+        Returns:
+            Seconds to wait before retrying
+        """
+        # spotipy.SpotifyException exposes headers directly, requests errors via .response
+        headers = getattr(error, 'headers', None)
+        if not headers and resp is not None:
+            headers = getattr(resp, 'headers', None)
+        
+        if headers:
+            try:
+                return max(float(headers.get('Retry-After', default)), 0.0)
+            except (TypeError, ValueError):
+                pass
+        
+        return default
+    
     def get_all_stats(self) -> Dict[str, Dict[str, Any]]:
         """Get statistics for all limiters."""
+        now = _monotonic()
         stats = {
-            "global": self.global_limiter.get_stats()
+            "global": self.global_limiter.get_stats(now=now)
         }
         
         for endpoint, limiter in self.limiters.items():
-            stats[endpoint] = limiter.get_stats()
+            stats[endpoint] = limiter.get_stats(now=now)
         
         return stats
 
 
+class BatchedSpotifyClient:
+    """
+    Coalesces concurrent per-ID Spotify lookups into batched API calls.
+    
+    Callers asking for IDs from the same endpoint and client within a short
+    window share one rate-limited request (up to the endpoint's ID limit),
+    so N concurrent lookups cost one rate limit token instead of N.
+    """
+    
+    # Maximum IDs per request for Spotify's multi-ID endpoints
+    BATCH_LIMITS = {
+        "audio_features": 100,
+        "tracks": 50,
+        "artists": 50,
+    }
+    
+    def __init__(self, rate_limiter: SpotifyRateLimiter, max_wait: float = 0.005):
+        """
+        Initialize batched client.
+        
+        Args:
+            rate_limiter: Spotify rate limiter used for the batched calls
+            max_wait: Seconds to collect IDs before issuing a batch
+        """
+        self.rate_limiter = rate_limiter
+        self.max_wait = max_wait
+        # (endpoint, func) -> (id -> future, flush timer)
+        self._pending: Dict[Tuple[str, Callable], Tuple[Dict[str, asyncio.Future], asyncio.TimerHandle]] = {}
+        # Strong references to in-flight batch tasks
+        self._tasks: set = set()
+    
+    async def fetch(self, endpoint: str, func: Callable, ids: List[str]) -> Dict[str, Any]:
+        """
+        Look up IDs through a coalesced batch call.
+        
+        Args:
+            endpoint: Multi-ID endpoint (a key of BATCH_LIMITS)
+            func: Spotify client method taking a list of IDs
+            ids: IDs to look up
+            
+        Returns:
+            Mapping of ID to its result (None if the lookup failed)
+        """
+        loop = asyncio.get_running_loop()
+        limit = self.BATCH_LIMITS[endpoint]
+        key = (endpoint, func)
+        futures: Dict[str, asyncio.Future] = {}
+        
+        for item_id in ids:
+            if item_id in futures:
+                continue
+            entry = self._pending.get(key)
+            if entry is None:
+                entry = self._pending[key] = ({}, loop.call_later(self.max_wait, self._flush, key))
+            pending = entry[0]
+            future = pending.get(item_id)
+            if future is None:
+                future = pending[item_id] = loop.create_future()
+            futures[item_id] = future
+            if len(pending) >= limit:
+                self._flush(key)
+        
+        if not futures:
+            return {}
+        
+        # wait() rather than gather() so a cancelled caller doesn't cancel futures shared with others
+        await asyncio.wait(futures.values())
+        return {item_id: future.result() for item_id, future in futures.items()}
+    
+    def _flush(self, key: Tuple[str, Callable]) -> None:
+        """Dispatch the IDs collected for key as one batch."""
+        entry = self._pending.pop(key, None)
+        if entry is None:
+            return
+        pending, timer = entry
+        timer.cancel()
+        task = asyncio.get_running_loop().create_task(self._dispatch(key[0], key[1], pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _dispatch(self, endpoint: str, func: Callable, pending: Dict[str, asyncio.Future]) -> None:
+        """
+        Make one rate-limited call for a batch and resolve its futures.
+        
+        Args:
+            endpoint: Endpoint category
+            func: Spotify client method taking a list of IDs
+            pending: Futures keyed by ID
+        """
+        ids = list(pending)
+        items: List[Any] = []
+        try:
+            result = await self.rate_limiter.rate_limited_call(endpoint, func, ids)
+            # audio_features returns a list; tracks/artists wrap it as {"tracks": [...]}
+            if isinstance(result, dict):
+                result = result.get(endpoint)
+            if result:
+                items = result
+            else:
+                logger.warning(f"Batched {endpoint} call for {len(ids)} IDs returned no results")
+        except Exception as e:
+            logger.error(f"Batched {endpoint} call failed: {e}")
+        finally:
+            # Spotify returns results in request order, with None for unknown IDs
+            for index, item_id in enumerate(ids):
+                future = pending[item_id]
+                if not future.done():
+                    future.set_result(items[index] if index < len(items) else None)
+
+
 class CacheManager:
     """
-    Simple in-memory cache with TTL for API responses.
+    Simple in-memory LRU cache with per-entry TTL for API responses.
     Reduces API calls by caching frequent requests.
+    
+    Entries live in an OrderedDict kept in recency order, and a min-heap of
+    (expire_time, seq, key) lets expired entries be dropped without scanning
+    the whole cache. Keys are the prefix alone, or a (prefix, args, kwargs)
+    tuple, so lookups never build strings; arguments must be hashable.
     """
     
-    def __init__(self, default_ttl: int = 300):  # 5 minutes default
+    def __init__(self, default_ttl: int = 300, max_entries: int = 10000):  # 5 minutes default
         """
         Initialize cache manager.
         
         Args:
             default_ttl: Default time-to-live in seconds
+            max_entries: Maximum entries kept before evicting least recently used
         """
-        self.cache = {}
+        self.cache: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, int, Hashable]] = []
+        # Tie-breaker so heap records never compare str keys against tuple keys
+        self._heap_seq = itertools.count()
         self.default_ttl = default_ttl
-        logger.info(f"Cache manager initialized with {default_ttl}s TTL")
+        self.max_entries = max_entries
+        self.evicted_entries = 0
+        self.expired_entries = 0
+        logger.info(f"Cache manager initialized with {default_ttl}s TTL (max {max_entries} entries)")
     
-    def _make_key(self, prefix: str, *args, **kwargs) -> str:
-        """Create cache key from arguments."""
-        key_parts = [prefix]
-        key_parts.extend(str(arg) for arg in args)
-        key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
-        return ":".join(key_parts)
+    def _purge_expired(self, now: float) -> int:
+        """
+        Drop entries whose expiry has passed, cheapest first from the heap.
+        Heap records left behind by overwritten or evicted keys are skipped.
+        
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        heap = self._expiry_heap
+        
+        while heap and heap[0][0] <= now:
+            expire_time, _, key = heapq.heappop(heap)
+            entry = self.cache.get(key)
+            if entry is not None and entry[1] == expire_time:
+                del self.cache[key]
+                removed += 1
+        
+        self._compact_heap()
+        
+        self.expired_entries += removed
+        return removed
+    
+    def _compact_heap(self):
+        """
+        Rebuild the expiry heap from the live entries once stale records
+        (from overwritten, evicted or invalidated keys) start to dominate.
+        Only runs after the heap has doubled, so the cost is amortized O(1) per set.
+        """
+        if len(self._expiry_heap) > 2 * len(self.cache) + 64:
+            self._expiry_heap = [
+                (expire_time, next(self._heap_seq), key)
+                for key, (_, expire_time) in self.cache.items()
+            ]
+            heapq.heapify(self._expiry_heap)
     
     def get(self, prefix: str, *args, **kwargs) -> Optional[Any]:
         """Get cached value if not expired."""
-        key = self._make_key(prefix, *args, **kwargs)
+        key = prefix if not args and not kwargs else (prefix, args, tuple(sorted(kwargs.items())))
+        entry = self.cache.get(key)
         
-        if key in self.cache:
-            value, expire_time = self.cache[key]
+        if entry is not None:
+            value, expire_time = entry
             if time.time() < expire_time:
+                self.cache.move_to_end(key)
                 return value
             else:
-                # Expired, remove from cache
+                # Expired, remove from cache (its heap record is skipped later)
                 del self.cache[key]
+                self.expired_entries += 1
         
         return None
     
-    def set(self, prefix: str, value: Any, ttl: Optional[int] = None, *args, **kwargs):
+    def set(self, prefix: str, value: Any, *args, ttl: Optional[int] = None, **kwargs):
         """Set cached value with TTL."""
-        key = self._make_key(prefix, *args, **kwargs)
-        expire_time = time.time() + (ttl or self.default_ttl)
+        key = prefix if not args and not kwargs else (prefix, args, tuple(sorted(kwargs.items())))
+        now = time.time()
+        expire_time = now + (ttl or self.default_ttl)
+        
         self.cache[key] = (value, expire_time)
+        self.cache.move_to_end(key)
+        heapq.heappush(self._expiry_heap, (expire_time, next(self._heap_seq), key))
+        
+        if len(self.cache) > self.max_entries:
+            # Prefer dropping expired entries before evicting live ones
+            self._purge_expired(now)
+            while len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+                self.evicted_entries += 1
+        else:
+            # Rewriting hot keys never overflows the cache, so the heap is
+            # compacted here too or its stale records would grow without bound
+            self._compact_heap()
     
     def invalidate(self, prefix: str, *args, **kwargs):
         """Invalidate specific cache entry."""
-        key = self._make_key(prefix, *args, **kwargs)
+        key = prefix if not args and not kwargs else (prefix, args, tuple(sorted(kwargs.items())))
         self.cache.pop(key, None)
     
     def clear_expired(self):
         """Remove expired entries."""
-        now = time.time()
-        expired_keys = [
-            key for key, (_, expire_time) in self.cache.items()
-            if now >= expire_time
-        ]
+        removed = self._purge_expired(time.time())
         
-        for key in expired_keys:
-            del self.cache[key]
-        
-        if expired_keys:
-            logger.info(f"Cleared {len(expired_keys)} expired cache entries")
+        if removed:
+            logger.info(f"Cleared {removed} expired cache entries")
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        now = time.time()
-        active_entries = sum(1 for _, expire_time in self.cache.values() if now < expire_time)
+        # Expired entries are purged first, so every remaining entry is active
+        self._purge_expired(time.time())
         
         return {
             "total_entries": len(self.cache),
-            "active_entries": active_entries,
-            "expired_entries": len(self.cache) - active_entries
+            "active_entries": len(self.cache),
+            "expired_entries": 0,
+            "max_entries": self.max_entries,
+            "evicted_entries": self.evicted_entries,
+            "expired_total": self.expired_entries
         }
+    
+    def namespace(self, name: str, default_ttl: Optional[int] = None) -> "CacheNamespace":
+        """
+        Get a view of this cache with its own key space and default TTL.
+        
+        Args:
+            name: Namespace name (keeps keys from colliding with other views)
+            default_ttl: TTL for sets without an explicit ttl (defaults to this cache's)
+            
+        Returns:
+            CacheNamespace sharing this cache's entries and size budget
+        """
+        return CacheNamespace(self, name, default_ttl or self.default_ttl)
 
 
+class CacheNamespace:
+    """
+    CacheManager view with its own key space and default TTL.
+    Several namespaces share one LRU, so all in-memory caches compete for a
+    single memory budget instead of each growing on its own.
+    """
+    
+    def __init__(self, cache: CacheManager, name: str, default_ttl: int):
+        """
+        Initialize cache namespace.
+        
+        Args:
+            cache: Shared cache manager
+            name: Namespace name
+            default_ttl: Default time-to-live in seconds
+        """
+        self._cache = cache
+        self.name = name
+        self.default_ttl = default_ttl
+    
+    def get(self, prefix: str, *args, **kwargs) -> Optional[Any]:
+        """Get cached value if not expired."""
+        return self._cache.get((self.name, prefix), *args, **kwargs)
+    
+    def set(self, prefix: str, value: Any, *args, ttl: Optional[int] = None, **kwargs):
+        """Set cached value with TTL."""
+        self._cache.set((self.name, prefix), value, *args, ttl=ttl or self.default_ttl, **kwargs)
+    
+    def invalidate(self, prefix: str, *args, **kwargs):
+        """Invalidate specific cache entry."""
+        self._cache.invalidate((self.name, prefix), *args, **kwargs)
+    
+    def clear_expired(self):
+        """Remove expired entries (from the shared cache)."""
+        self._cache.clear_expired()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics of the shared cache."""
+        return self._cache.get_stats()
+
 
 class UserRateLimiter:
     """
@@ -344,6 +927,19 @@ class UserRateLimiter:
     Uses sliding window counter with Redis for distributed deployments.
     """
     
+    # In-memory fallback shard count (power of two, indexed by hash mask)
+    NUM_SHARDS = 64
+    
+    # Redis keys: per-user window hashes plus a zset of last-seen times
+    KEY_PREFIX = USER_RATE_LIMIT_KEY_PREFIX
+    ACTIVE_USERS_KEY = "user_rate_limit_sw_active"
+    
+    # Max idle users removed per sweep script call
+    GC_BATCH_SIZE = 500
+    
+    # Window hashes expire after this many idle windows even if the sweep never runs
+    FALLBACK_TTL_WINDOWS = 10
+    
     def __init__(self, requests_per_minute: int = 100, window_seconds: int = 60):
         """
         Initialize user-level rate limiter.
@@ -359,68 +955,209 @@ class UserRateLimiter:
         try:
             from core.services.redis_cache import user_data_cache
             self.cache = user_data_cache
+            # register_script runs via EVALSHA and reloads the script if Redis lost it
+            self._sliding_window = user_data_cache.client.register_script(SLIDING_WINDOW_LUA)
+            self._sweep_idle_users = user_data_cache.client.register_script(SWEEP_IDLE_USERS_LUA)
             self.use_redis = True
             logger.info(f"UserRateLimiter initialized with Redis (limit: {requests_per_minute} req/min)")
         except Exception as e:
             logger.warning(f"Redis not available for rate limiting, using in-memory: {e}")
-            self.cache = {}
+            self.cache = None
             self.use_redis = False
+        
+        # In-memory fallback: user windows spread over shards, each with its own
+        # lock, so concurrent tasks for the same user can't lose updates.
+        # Each entry is (packed prev/current counts, current window index).
+        self._shards: List[Dict[str, Tuple[int, int]]] = [{} for _ in range(self.NUM_SHARDS)]
+        self._shard_locks = [asyncio.Lock() for _ in range(self.NUM_SHARDS)]
+        self._gc_task: Optional[asyncio.Task] = None
+    
+    def _shard_index(self, user_id: str) -> int:
+        """Shard holding a user's in-memory request window."""
+        return hash(user_id) & (self.NUM_SHARDS - 1)
+    
+    def _ensure_gc_task(self):
+        """Start the idle-window GC loop on first use (needs a running loop)."""
+        if self._gc_task is None or self._gc_task.done():
+            self._gc_task = asyncio.get_running_loop().create_task(self._gc_loop())
+    
+    async def _gc_loop(self):
+        """Periodically drop windows of users with no requests in the last window."""
+        while True:
+            await asyncio.sleep(self.window_seconds)
+            
+            try:
+                if self.use_redis:
+                    removed = await asyncio.to_thread(self._sweep_redis, time.time())
+                else:
+                    removed = await self._sweep_memory(time.time())
+            except Exception as e:
+                logger.error(f"Rate limiter GC failed: {e}")
+                continue
+            
+            if removed:
+                logger.debug(f"Rate limiter GC removed {removed} idle user windows")
     
-    async def check_rate_limit(self, user_id: str) -> tuple[bool, Optional[int]]:
+    def _sweep_redis(self, now: float) -> int:
+        """
+        Delete Redis windows of users idle for two windows, in batches.
+        A user's hash is only read for the current and previous window, so
+        anything older is dead weight.
+        
+        Args:
+            now: Current time
+            
+        Returns:
+            Number of users removed
+        """
+        cutoff = now - 2 * self.window_seconds
+        client = self.cache.client
+        removed = 0
+        
+        while True:
+            stale = client.zrangebyscore(
+                self.ACTIVE_USERS_KEY, '-inf', cutoff, start=0, num=self.GC_BATCH_SIZE
+            )
+            if not stale:
+                return removed
+            
+            # Every key the script touches is declared in KEYS
+            removed += int(self._sweep_idle_users(
+                keys=[self.ACTIVE_USERS_KEY, *(_rl_key(user_id.decode()) for user_id in stale)],
+                args=[cutoff, *stale]
+            ))
+            
+            if len(stale) < self.GC_BATCH_SIZE:
+                return removed
+    
+    async def _sweep_memory(self, now: float) -> int:
+        """
+        Drop in-memory windows of users idle since before the previous window.
+        
+        Args:
+            now: Current time
+            
+        Returns:
+            Number of users removed
+        """
+        # Counters last written before the previous window no longer count
+        oldest_live_window = int(now // self.window_seconds) - 1
+        removed = 0
+        
+        for shard, lock in zip(self._shards, self._shard_locks):
+            async with lock:
+                stale = [
+                    user_id for user_id, (_, cw) in shard.items()
+                    if cw < oldest_live_window
+                ]
+                for user_id in stale:
+                    del shard[user_id]
+                removed += len(stale)
+        
+        return removed
+    
+    def _roll_window(
+        self, now: float, cw: Optional[int], count: int, prev: int
+    ) -> Tuple[int, int, int, float]:
+        """
+        Advance sliding window counters to the window containing now.
+        
+        Args:
+            now: Current time
+            cw: Window index the counters were last written in (None if never)
+            count: Requests counted in window cw
+            prev: Requests counted in the window before cw
+            
+        Returns:
+            Tuple of (current_window, count, prev_count, seconds_into_window)
+        """
+        current_window = int(now // self.window_seconds)
+        
+        if cw != current_window:
+            prev = count if cw == current_window - 1 else 0
+            count = 0
+        
+        return current_window, count, prev, now - current_window * self.window_seconds
+    
+    def _sliding_window_count(self, now: float, state: List[Optional[bytes]]) -> Tuple[float, int]:
+        """
+        Evaluate the sliding window state without modifying it.
+        
+        Args:
+            now: Current time
+            state: HMGET result (or in-memory equivalent) for (cw, count, prev_count)
+            
+        Returns:
+            Tuple of (weighted_request_count, seconds_until_window_rolls)
+        """
+        cw = int(state[0]) if state[0] is not None else None
+        _, count, prev, elapsed = self._roll_window(now, cw, int(state[1] or 0), int(state[2] or 0))
+        
+        weighted = prev * (self.window_seconds - elapsed) / self.window_seconds + count
+        return weighted, int(self.window_seconds - elapsed)
+    
+    async def check_rate_limit(self, user_id: str, now: Optional[float] = None) -> tuple[bool, Optional[int]]:
         """
         Check if user is within rate limit.
         
         Args:
             user_id: User identifier
+            now: Wall-clock time already read by the caller (windows are
+                aligned to wall-clock time so all instances agree in Redis)
             
         Returns:
             Tuple of (is_allowed, retry_after_seconds)
         """
         try:
-            now = time.time()
-            window_start = now - self.window_seconds
+            if now is None:
+                now = time.time()
+            
+            self._ensure_gc_task()
             
             if self.use_redis:
-                # Redis-based sliding window
-                key_prefix = f"user_rate_limit:{user_id}"
-                
-                # Get current count
-                current_count = self.cache.get(key_prefix, user_id=user_id) or 0
-                
-                if current_count >= self.requests_per_minute:
-                    # Get TTL to tell user when they can retry
-                    ttl = self.cache.get_ttl(key_prefix, user_id=user_id)
-                    retry_after = max(1, ttl) if ttl > 0 else self.window_seconds
-                    return False, retry_after
+                # Redis-based sliding window, checked and incremented atomically
+                key = _rl_key(user_id)
+                allowed, retry_after = self._sliding_window(
+                    keys=[key, self.ACTIVE_USERS_KEY],
+                    args=[
+                        now, self.window_seconds, self.requests_per_minute, user_id,
+                        self.window_seconds * self.FALLBACK_TTL_WINDOWS
+                    ]
+                )
                 
-                # Increment counter
-                new_count = self.cache.increment(key_prefix, 1, user_id=user_id)
-                
-                # Set expiry on first request in window
-                if new_count == 1:
-                    self.cache.set(key_prefix, 1, ttl=self.window_seconds, user_id=user_id)
+                if not allowed:
+                    return False, int(retry_after)
                 
                 return True, None
                 
             else:
-                # In-memory fallback (not recommended for multi-instance)
-                if user_id not in self.cache:
-                    self.cache[user_id] = deque()
-                
-                user_requests = self.cache[user_id]
-                
-                # Remove old requests outside window
-                while user_requests and user_requests[0] < window_start:
-                    user_requests.popleft()
+                # In-memory fallback (not recommended for multi-instance), same
+                # sliding window counter as the Redis script with both window
+                # counts packed into one int: (prev_count << 32) | count
+                idx = self._shard_index(user_id)
                 
-                if len(user_requests) >= self.requests_per_minute:
-                    # Calculate retry_after based on oldest request
-                    retry_after = int(self.window_seconds - (now - user_requests[0]))
-                    return False, max(1, retry_after)
-                
-                # Add current request
-                user_requests.append(now)
-                return True, None
+                async with self._shard_locks[idx]:
+                    shard = self._shards[idx]
+                    packed, cw = shard.get(user_id, _EMPTY_WINDOW)
+                    
+                    current_window, count, prev, elapsed = self._roll_window(
+                        now, cw, packed & COUNT_MASK, packed >> 32
+                    )
+                    
+                    window = self.window_seconds
+                    limit = self.requests_per_minute
+                    weighted = prev * (window - elapsed) / window + count
+                    
+                    if weighted >= limit:
+                        # Time until the previous window's share decays enough
+                        if prev > 0 and count < limit:
+                            retry_after = window * (1 - (limit - count) / prev) - elapsed
+                        else:
+                            retry_after = window - elapsed
+                        return False, max(1, math.ceil(retry_after))
+                    
+                    shard[user_id] = ((prev << 32) | (count + 1), current_window)
+                    return True, None
                 
         except Exception as e:
             logger.error(f"Rate limit check error for user {user_id}: {e}")
@@ -439,20 +1176,23 @@ class UserRateLimiter:
             True if permission granted
         """
         start_time = time.time()
+        now = start_time
         
-        while time.time() - start_time < timeout:
-            allowed, retry_after = await self.check_rate_limit(user_id)
+        while now - start_time < timeout:
+            allowed, retry_after = await self.check_rate_limit(user_id, now=now)
             
             if allowed:
                 return True
             
             # Wait before retry
             if retry_after:
-                wait_time = min(retry_after, timeout - (time.time() - start_time))
+                wait_time = min(retry_after, timeout - (now - start_time))
                 if wait_time > 0:
                     await asyncio.sleep(wait_time)
             else:
                 await asyncio.sleep(0.5)
+            
+            now = time.time()
         
         logger.warning(f"User {user_id} rate limit timeout after {timeout}s")
         return False
@@ -461,25 +1201,23 @@ class UserRateLimiter:
         """Get rate limit stats for a user."""
         try:
             if self.use_redis:
-                key_prefix = f"user_rate_limit:{user_id}"
-                current_count = self.cache.get(key_prefix, user_id=user_id) or 0
-                ttl = self.cache.get_ttl(key_prefix, user_id=user_id)
+                state = self.cache.client.hmget(_rl_key(user_id), 'cw', 'count', 'prev_count')
+                weighted, reset_in = self._sliding_window_count(time.time(), state)
+                current_count = int(weighted)
                 
                 return {
                     "user_id": user_id,
                     "current_requests": current_count,
                     "limit": self.requests_per_minute,
                     "window_seconds": self.window_seconds,
-                    "reset_in_seconds": max(0, ttl) if ttl > 0 else 0,
+                    "reset_in_seconds": max(0, reset_in),
                     "percentage_used": round((current_count / self.requests_per_minute) * 100, 1)
                 }
             else:
-                user_requests = self.cache.get(user_id, deque())
-                now = time.time()
-                window_start = now - self.window_seconds
-                
-                # Count recent requests
-                recent_count = sum(1 for req_time in user_requests if req_time >= window_start)
+                # Shared read-only sentinel for unknown users; never mutated
+                packed, cw = self._shards[self._shard_index(user_id)].get(user_id, _EMPTY_WINDOW)
+                weighted, _ = self._sliding_window_count(time.time(), (cw, packed & COUNT_MASK, packed >> 32))
+                recent_count = int(weighted)
                 
                 return {
                     "user_id": user_id,
@@ -493,13 +1231,40 @@ class UserRateLimiter:
             return {"error": str(e)}
 
 
-# Global instances for the application
+# Global instances for the application, created on first access so importing
+# this module (e.g. only for the caches) doesn't build the limiters
+
+@lru_cache(maxsize=None)
+def get_spotify_rate_limiter() -> SpotifyRateLimiter:
+    """Spotify rate limiter (endpoint-specific)."""
+    return SpotifyRateLimiter()
+
+
+@lru_cache(maxsize=None)
+def get_user_rate_limiter() -> UserRateLimiter:
+    """User-level rate limiter (100 req/min per user, supports 500-1000 users)."""
+    return UserRateLimiter(requests_per_minute=100)
+
+
+@lru_cache(maxsize=None)
+def get_spotify_batcher() -> BatchedSpotifyClient:
+    """Coalescing client for multi-ID Spotify endpoints."""
+    return BatchedSpotifyClient(get_spotify_rate_limiter())
+
+
+_LAZY_INSTANCES = {
+    "spotify_rate_limiter": get_spotify_rate_limiter,
+    "spotify_batcher": get_spotify_batcher,
+    "user_rate_limiter": get_user_rate_limiter,
+}
 
-# Spotify rate limiter (endpoint-specific)
-spotify_rate_limiter = SpotifyRateLimiter()
 
-# User-level rate limiter (100 req/min per user, supports 500-1000 users)
-user_rate_limiter = UserRateLimiter(requests_per_minute=100)
+def __getattr__(name: str) -> Any:
+    """Resolve the module-level limiter/batcher instances lazily (PEP 562)."""
+    factory = _LAZY_INSTANCES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return factory()
 
 # Import Redis cache instances (replaces old CacheManager)
 try:
@@ -522,12 +1287,14 @@ try:
 except ImportError as e:
     logger.warning(f"Redis cache not available, falling back to in-memory: {e}")
     
-    # Fallback to in-memory CacheManager (development only)
-    spotify_cache = CacheManager(default_ttl=300)
-    user_data_cache = CacheManager(default_ttl=1800)
-    recommendations_cache = CacheManager(default_ttl=86400)
-    audio_features_cache = CacheManager(default_ttl=604800)
-    api_cache = CacheManager(default_ttl=21600)
+    # Fallback to in-memory CacheManager (development only): one shared LRU,
+    # with a namespace per cache for its key space and default TTL
+    _memory_cache = CacheManager(default_ttl=300, max_entries=50000)
+    spotify_cache = _memory_cache.namespace("spotify", default_ttl=300)
+    user_data_cache = _memory_cache.namespace("user_data", default_ttl=1800)
+    recommendations_cache = _memory_cache.namespace("recommendations", default_ttl=86400)
+    audio_features_cache = _memory_cache.namespace("audio_features", default_ttl=604800)
+    api_cache = _memory_cache.namespace("api", default_ttl=21600)
     
     # TTL constants
     RECOMMENDATIONS_TTL = 86400
@@ -9,16 +9,32 @@ Implements the weighted scoring algorithm per spec:
 Integrates RL scores as an additional component for continuous improvement.
 """
 
+import re
+import asyncio
 import numpy as np
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
-from sklearn.metrics.pairwise import cosine_similarity
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 
 from core.database.models import PersonalityTrait
 
 logger = logging.getLogger("bondhu.recommendation_scoring")
 
+# Ranking is CPU-bound numpy work; one warm thread keeps it off the event loop
+# and serializes requests instead of oversubscribing cores with BLAS threads
+_scorer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scorer")
+
+
+@lru_cache(maxsize=16)
+def _decay_weights(history_length: int) -> np.ndarray:
+    """Recency decay weights (1.0 -> 0.5) for a history, normalized to sum to 1."""
+    weights = np.linspace(1.0, 0.5, history_length, dtype=np.float32)
+    weights /= weights.sum()
+    weights.flags.writeable = False
+    return weights
+
 
 class RecommendationScorer:
     """
@@ -76,10 +92,51 @@ class RecommendationScorer:
         'acousticness', 'instrumentalness', 'speechiness'
     ]
     
+    # Audio targets a trait mapping may define
+    TARGET_FEATURES = ['valence', 'energy', 'danceability', 'acousticness', 'tempo']
+    
     def __init__(self):
         """Initialize recommendation scorer."""
+        # TRAIT_AUDIO_MAPPING as arrays for batched personality scoring:
+        # per-trait targets over AUDIO_FEATURES (NaN = trait doesn't constrain it)
+        self._traits = list(self.TRAIT_AUDIO_MAPPING)
+        self._trait_targets = np.full((len(self._traits), len(self.AUDIO_FEATURES)), np.nan, dtype=np.float32)
+        self._trait_weights = np.empty(len(self._traits), dtype=np.float32)
+        self._trait_has_genres = np.zeros(len(self._traits), dtype=bool)
+        
+        for t, trait in enumerate(self._traits):
+            mapping = self.TRAIT_AUDIO_MAPPING[trait]
+            self._trait_weights[t] = mapping['weight']
+            self._trait_has_genres[t] = 'genres' in mapping
+            for feature_name in self.TARGET_FEATURES:
+                if f'target_{feature_name}' in mapping:
+                    self._trait_targets[t, self.AUDIO_FEATURES.index(feature_name)] = mapping[f'target_{feature_name}']
+        
+        self._trait_target_counts = (~np.isnan(self._trait_targets)).sum(axis=1).astype(np.float32)
+        
+        # One precompiled alternation per trait genre list, so matching a track
+        # is a single scan of its joined genre string (substring semantics kept)
+        self._preferred_genre_patterns = [
+            self._compile_genre_pattern(self.TRAIT_AUDIO_MAPPING[trait].get('genres'))
+            for trait in self._traits
+        ]
+        self._negative_genre_patterns = [
+            self._compile_genre_pattern(self.TRAIT_AUDIO_MAPPING[trait].get('negative_genres'))
+            for trait in self._traits
+        ]
+        
+        # Profile-dependent terms, reused while a user's profile is unchanged
+        self._profile_terms = lru_cache(maxsize=1024)(self._specialize_profile)
+        
         logger.info("RecommendationScorer initialized with spec-compliant weights")
     
+    @staticmethod
+    def _compile_genre_pattern(genres: Optional[List[str]]) -> Optional[re.Pattern]:
+        """Regex matching any of the (lowercase) genres as a substring, or None."""
+        if not genres:
+            return None
+        return re.compile('|'.join(re.escape(genre.lower()) for genre in genres))
+    
     def normalize_tempo(self, tempo: float) -> float:
         """Normalize tempo to 0-1 scale (40-200 BPM range)."""
         return np.clip((tempo - 40) / 160, 0, 1)
@@ -105,7 +162,72 @@ class RecommendationScorer:
             # Ensure value is in [0, 1]
             features.append(np.clip(float(value) if value is not None else 0.5, 0, 1))
         
-        return np.array(features)
+        return np.array(features, dtype=np.float32)
+    
+    def build_feature_matrix(self, tracks: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Stack audio feature vectors for many tracks into one matrix.
+        Same values as extract_audio_vector, but tempo normalization and
+        clipping are applied to whole columns at once.
+        
+        Args:
+            tracks: Tracks with audio features
+            
+        Returns:
+            (N, len(AUDIO_FEATURES)) float32 matrix, one row per track
+        """
+        matrix = np.empty((len(tracks), len(self.AUDIO_FEATURES)), dtype=np.float32)
+        tempo_col = self.AUDIO_FEATURES.index('tempo')
+        
+        for i, track in enumerate(tracks):
+            row = matrix[i]
+            for j, feature_name in enumerate(self.AUDIO_FEATURES):
+                # Same missing-key default as extract_audio_vector (a missing
+                # tempo is 0.5 BPM, unlike a None tempo which becomes 120)
+                value = track.get(feature_name, 0.5)
+                if j == tempo_col:
+                    row[j] = value if value else 120
+                else:
+                    row[j] = value if value is not None else 0.5
+        
+        matrix[:, tempo_col] = (matrix[:, tempo_col] - 40) / 160
+        np.clip(matrix, 0, 1, out=matrix)
+        return matrix
+    
+    def batch_history_similarity(
+        self,
+        candidate_matrix: np.ndarray,
+        history_matrix: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate history similarity for all candidates at once.
+        Rows are L2-normalized once, so the weighted cosine similarities
+        reduce to matrix-vector products.
+        
+        Args:
+            candidate_matrix: (N, F) candidate feature matrix
+            history_matrix: (M, F) listening history feature matrix
+            
+        Returns:
+            (N,) similarity scores [0, 1]
+        """
+        if history_matrix.shape[0] == 0:
+            return np.full(candidate_matrix.shape[0], 0.5, dtype=np.float32)  # Neutral score if no history
+        
+        # Weighted average per candidate (recent tracks weighted more). The
+        # weighted sum of similarities equals the similarity to the weighted
+        # sum of normalized history rows, so the (N, M) matrix is never built.
+        history_profile = self._normalize_rows(history_matrix).T @ _decay_weights(history_matrix.shape[0])
+        weighted_sim = self._normalize_rows(candidate_matrix) @ history_profile
+        
+        return np.clip(weighted_sim, 0, 1)
+    
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """L2-normalize rows; all-zero rows stay zero (cosine similarity 0)."""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
     
     def calculate_history_similarity(
         self, 
@@ -127,24 +249,11 @@ class RecommendationScorer:
             return 0.5  # Neutral score if no history
         
         try:
-            # Extract candidate vector
-            candidate_vector = self.extract_audio_vector(candidate_track).reshape(1, -1)
-            
-            # Extract history vectors
-            history_vectors = np.array([
-                self.extract_audio_vector(track) 
-                for track in listening_history
-            ])
-            
-            # Calculate cosine similarity with all history tracks
-            similarities = cosine_similarity(candidate_vector, history_vectors)[0]
-            
-            # Use weighted average (recent tracks weighted more)
-            weights = np.linspace(1.0, 0.5, len(similarities))  # Decay weights
-            weighted_sim = np.average(similarities, weights=weights)
-            
-            # Normalize to [0, 1]
-            return float(np.clip(weighted_sim, 0, 1))
+            scores = self.batch_history_similarity(
+                self.build_feature_matrix([candidate_track]),
+                self.build_feature_matrix(listening_history)
+            )
+            return float(scores[0])
             
         except Exception as e:
             logger.error(f"Error calculating history similarity: {e}")
@@ -167,78 +276,124 @@ class RecommendationScorer:
             Personality match score [0, 1]
         """
         try:
-            total_score = 0.0
-            total_weight = 0.0
-            
-            for trait, trait_value in personality_profile.items():
-                if trait not in self.TRAIT_AUDIO_MAPPING:
-                    continue
-                
-                mapping = self.TRAIT_AUDIO_MAPPING[trait]
-                trait_weight = mapping['weight']
-                trait_score = 0.0
-                score_components = 0
-                
-                # Target audio features
-                for target_feature in ['target_valence', 'target_energy', 'target_danceability', 'target_acousticness', 'target_tempo']:
-                    if target_feature in mapping:
-                        feature_name = target_feature.replace('target_', '')
-                        target_value = mapping[target_feature]
-                        
-                        actual_value = candidate_track.get(feature_name, 0.5)
-                        if feature_name == 'tempo':
-                            actual_value = self.normalize_tempo(actual_value if actual_value else 120)
-                        
-                        # Distance from target (closer is better)
-                        distance = abs(float(actual_value) - target_value)
-                        component_score = 1.0 - distance
-                        
-                        # Weight by trait value
-                        trait_score += component_score * trait_value
-                        score_components += 1
-                
-                # Genre matching
-                if 'genres' in mapping:
-                    track_genres = candidate_track.get('genres', [])
-                    if isinstance(track_genres, list):
-                        genre_match = any(
-                            preferred_genre in ' '.join(track_genres).lower()
-                            for preferred_genre in mapping['genres']
-                        )
-                        if genre_match:
-                            trait_score += trait_value * 0.5
-                            score_components += 1
-                
-                # Negative genre penalty
-                if 'negative_genres' in mapping:
-                    track_genres = candidate_track.get('genres', [])
-                    if isinstance(track_genres, list):
-                        genre_mismatch = any(
-                            neg_genre in ' '.join(track_genres).lower()
-                            for neg_genre in mapping['negative_genres']
-                        )
-                        if genre_mismatch:
-                            trait_score -= trait_value * 0.3
-                
-                # Average trait score
-                if score_components > 0:
-                    trait_score /= score_components
-                
-                total_score += trait_score * trait_weight
-                total_weight += trait_weight
-            
-            # Normalize
-            if total_weight > 0:
-                final_score = total_score / total_weight
-            else:
-                final_score = 0.5
-            
-            return float(np.clip(final_score, 0, 1))
+            scores = self.batch_personality_match(
+                [candidate_track],
+                personality_profile,
+                self.build_feature_matrix([candidate_track])
+            )
+            return float(scores[0])
             
         except Exception as e:
             logger.error(f"Error calculating personality match: {e}")
             return 0.5
     
+    def _genre_matches(self, track: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Preferred / negative genre hits of a track for every mapped trait.
+        
+        Args:
+            track: Track with optional 'genres' list
+            
+        Returns:
+            Tuple of (preferred_hits, negative_hits) bool arrays, one entry per trait
+        """
+        preferred = np.zeros(len(self._traits), dtype=bool)
+        negative = np.zeros(len(self._traits), dtype=bool)
+        
+        track_genres = track.get('genres', [])
+        if not isinstance(track_genres, list):
+            return preferred, negative
+        
+        joined_genres = ' '.join(track_genres).lower()
+        for t in range(len(self._traits)):
+            preferred_pattern = self._preferred_genre_patterns[t]
+            negative_pattern = self._negative_genre_patterns[t]
+            preferred[t] = preferred_pattern is not None and preferred_pattern.search(joined_genres) is not None
+            negative[t] = negative_pattern is not None and negative_pattern.search(joined_genres) is not None
+        
+        return preferred, negative
+    
+    def _specialize_profile(
+        self,
+        profile_values: Tuple[Optional[float], ...]
+    ) -> Optional[Tuple[np.ndarray, Tuple[str, ...]]]:
+        """
+        Precompute the profile-dependent parts of personality scoring.
+        
+        Args:
+            profile_values: Trait values in mapping order (None = trait absent)
+            
+        Returns:
+            Per-trait coefficients (trait value x normalized mapping weight) and
+            the feature names targeted by present traits, or None if no trait
+            is present
+        """
+        present = np.array([value is not None for value in profile_values])
+        if not present.any():
+            return None
+        
+        trait_values = np.array(
+            [float(value) if value is not None else 0.0 for value in profile_values], dtype=np.float32
+        )
+        weights = self._trait_weights * present
+        trait_coefficients = trait_values * weights / weights.sum()
+        trait_coefficients.flags.writeable = False
+        
+        targeted = tuple(
+            feature_name for f, feature_name in enumerate(self.AUDIO_FEATURES)
+            if feature_name != 'tempo' and not np.isnan(self._trait_targets[present, f]).all()
+        )
+        return trait_coefficients, targeted
+    
+    def batch_personality_match(
+        self,
+        candidate_tracks: List[Dict[str, Any]],
+        personality_profile: Dict[PersonalityTrait, float],
+        candidate_matrix: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate personality match for all candidates at once.
+        Per trait: mean of (1 - |feature - target|) over the trait's audio
+        targets and its genre bonus, scaled by the trait value, then averaged
+        across traits by mapping weight.
+        
+        Args:
+            candidate_tracks: Candidate tracks (for genres)
+            personality_profile: User's Big Five scores (0-1 scale)
+            candidate_matrix: (N, F) feature matrix for candidate_tracks
+            
+        Returns:
+            (N,) personality match scores [0, 1]
+        """
+        n = len(candidate_tracks)
+        
+        terms = self._profile_terms(
+            tuple(personality_profile.get(trait) for trait in self._traits)
+        )
+        if terms is None:
+            return np.full(n, 0.5, dtype=np.float32)
+        trait_coefficients, targeted = terms
+        
+        # (N, T, F) distances to every trait target, summed over constrained features
+        closeness = 1.0 - np.abs(candidate_matrix[:, None, :] - self._trait_targets[None, :, :])
+        feature_scores = np.nansum(closeness, axis=2)
+        
+        preferred = np.empty((n, len(self._traits)), dtype=bool)
+        negative = np.empty((n, len(self._traits)), dtype=bool)
+        neutral = np.zeros(n, dtype=bool)
+        for i, track in enumerate(candidate_tracks):
+            preferred[i], negative[i] = self._genre_matches(track)
+            neutral[i] = any(track.get(feature_name, 0.5) is None for feature_name in targeted)
+        
+        trait_scores = feature_scores + np.float32(0.5) * preferred - np.float32(0.3) * negative
+        components = self._trait_target_counts + (preferred & self._trait_has_genres)
+        trait_scores /= np.maximum(components, 1)
+        
+        final_scores = trait_scores @ trait_coefficients
+        final_scores[neutral] = 0.5
+        
+        return np.clip(final_scores, 0, 1)
+    
     def calculate_diversity_bonus(
         self, 
         candidate_track: Dict[str, Any], 
@@ -246,7 +401,8 @@ class RecommendationScorer:
     ) -> float:
         """
         Calculate diversity bonus for adding variety to recommendations.
-        Penalizes similar tracks already in recommendation set.
+        Penalizes similarity to the centroid of the recommendations already
+        selected, with a bonus for artists not yet in the set.
         
         Args:
             candidate_track: Candidate track
@@ -259,37 +415,58 @@ class RecommendationScorer:
             return 1.0  # Max diversity for first track
         
         try:
-            candidate_vector = self.extract_audio_vector(candidate_track).reshape(1, -1)
-            
-            # Calculate similarity to existing recommendations
-            existing_vectors = np.array([
-                self.extract_audio_vector(track) 
-                for track in current_recommendations
-            ])
-            
-            similarities = cosine_similarity(candidate_vector, existing_vectors)[0]
-            
-            # Diversity = inverse of average similarity
-            avg_similarity = np.mean(similarities)
-            diversity_score = 1.0 - avg_similarity
-            
-            # Bonus for different artists
-            candidate_artist = candidate_track.get('artist_name', '').lower()
-            existing_artists = {track.get('artist_name', '').lower() for track in current_recommendations}
-            
-            if candidate_artist not in existing_artists:
-                diversity_score += 0.2
-            
-            return float(np.clip(diversity_score, 0, 1))
+            selected_artists = {self._artist_key(track) for track in current_recommendations}
+            scores = self.batch_diversity_bonus(
+                self.build_feature_matrix([candidate_track]),
+                self.build_feature_matrix(current_recommendations).sum(axis=0),
+                len(current_recommendations),
+                np.array([self._artist_key(candidate_track) not in selected_artists])
+            )
+            return float(scores[0])
             
         except Exception as e:
             logger.error(f"Error calculating diversity: {e}")
             return 0.5
     
+    def batch_diversity_bonus(
+        self,
+        candidate_matrix: np.ndarray,
+        selected_sum: np.ndarray,
+        selected_count: int,
+        new_artist: np.ndarray
+    ) -> np.ndarray:
+        """
+        Diversity bonus for many candidates against one selected set.
+        Diversity = 1 - cosine similarity to the selected set's mean feature
+        vector, +0.2 for an artist not already selected.
+        
+        Args:
+            candidate_matrix: (N, F) candidate feature matrix
+            selected_sum: (F,) sum of the selected tracks' feature vectors
+            selected_count: Number of selected tracks
+            new_artist: (N,) whether each candidate's artist is not yet selected
+            
+        Returns:
+            (N,) diversity scores [0, 1]
+        """
+        if selected_count == 0:
+            return np.ones(candidate_matrix.shape[0], dtype=np.float32)  # Max diversity for first track
+        
+        centroid = self._normalize_rows((selected_sum / selected_count)[None, :])[0]
+        similarities = self._normalize_rows(candidate_matrix) @ centroid
+        
+        return np.clip(1.0 - similarities + np.float32(0.2) * new_artist, 0, 1)
+    
+    @staticmethod
+    def _artist_key(track: Dict[str, Any]) -> str:
+        """Case-insensitive artist key used for diversity and novelty checks."""
+        return (track.get('artist_name') or '').lower()
+    
     def calculate_novelty_factor(
         self, 
         candidate_track: Dict[str, Any], 
-        listening_history: List[Dict[str, Any]]
+        listening_history: List[Dict[str, Any]],
+        history_keys: Optional[Tuple[set, set]] = None
     ) -> float:
         """
         Calculate novelty factor (discovery bonus).
@@ -298,6 +475,7 @@ class RecommendationScorer:
         Args:
             candidate_track: Candidate track
             listening_history: User's listening history
+            history_keys: Precomputed history_keys(listening_history), reused across candidates
             
         Returns:
             Novelty score [0, 1]
@@ -306,16 +484,18 @@ class RecommendationScorer:
             return 0.8  # High novelty if no history
         
         try:
+            if history_keys is None:
+                history_keys = self.history_keys(listening_history)
+            history_ids, history_artists = history_keys
+            
             # Check if track is in history
             candidate_id = candidate_track.get('track_id', '') or candidate_track.get('id', '')
-            history_ids = {track.get('track_id', '') or track.get('id', '') for track in listening_history}
             
             if candidate_id in history_ids:
                 return 0.2  # Low novelty for already heard track
             
             # Check if artist is new
-            candidate_artist = candidate_track.get('artist_name', '').lower()
-            history_artists = {track.get('artist_name', '').lower() for track in listening_history}
+            candidate_artist = self._artist_key(candidate_track)
             
             if candidate_artist not in history_artists:
                 novelty = 0.9  # High novelty for new artist
@@ -334,13 +514,29 @@ class RecommendationScorer:
             logger.error(f"Error calculating novelty: {e}")
             return 0.5
     
+    def history_keys(self, listening_history: List[Dict[str, Any]]) -> Tuple[set, set]:
+        """
+        Track IDs and artist keys in the listening history, for novelty checks.
+        
+        Args:
+            listening_history: User's listening history
+            
+        Returns:
+            Tuple of (track_ids, artist_keys)
+        """
+        history_ids = {track.get('track_id', '') or track.get('id', '') for track in listening_history}
+        history_artists = {self._artist_key(track) for track in listening_history}
+        return history_ids, history_artists
+    
     def calculate_composite_score(
         self,
         candidate_track: Dict[str, Any],
         listening_history: List[Dict[str, Any]],
         personality_profile: Dict[PersonalityTrait, float],
         current_recommendations: List[Dict[str, Any]],
-        rl_score: Optional[float] = None
+        rl_score: Optional[float] = None,
+        history_sim: Optional[float] = None,
+        personality_match: Optional[float] = None
     ) -> Dict[str, float]:
         """
         Calculate composite recommendation score using all components.
@@ -351,13 +547,17 @@ class RecommendationScorer:
             personality_profile: User's Big Five personality scores
             current_recommendations: Already selected recommendations
             rl_score: Optional RL score to integrate
+            history_sim: Precomputed history similarity (computed if omitted)
+            personality_match: Precomputed personality match (computed if omitted)
             
         Returns:
             Dict with component scores and final weighted score
         """
         # Calculate all components
-        history_sim = self.calculate_history_similarity(candidate_track, listening_history)
-        personality_match = self.calculate_personality_match(candidate_track, personality_profile)
+        if history_sim is None:
+            history_sim = self.calculate_history_similarity(candidate_track, listening_history)
+        if personality_match is None:
+            personality_match = self.calculate_personality_match(candidate_track, personality_profile)
         diversity = self.calculate_diversity_bonus(candidate_track, current_recommendations)
         novelty = self.calculate_novelty_factor(candidate_track, listening_history)
         
@@ -385,13 +585,28 @@ class RecommendationScorer:
             'rl_adjusted': rl_score is not None
         }
     
+    def _safe_personality_scores(
+        self,
+        candidate_tracks: List[Dict[str, Any]],
+        personality_profile: Dict[PersonalityTrait, float],
+        candidate_matrix: np.ndarray
+    ) -> np.ndarray:
+        """Batched personality match, falling back to neutral scores on error."""
+        try:
+            return self.batch_personality_match(candidate_tracks, personality_profile, candidate_matrix)
+        except Exception as e:
+            logger.error(f"Error calculating personality match: {e}")
+            return np.full(len(candidate_tracks), 0.5, dtype=np.float32)
+    
     def rank_candidates(
         self,
         candidate_tracks: List[Dict[str, Any]],
         listening_history: List[Dict[str, Any]],
         personality_profile: Dict[PersonalityTrait, float],
         max_results: int = 50,
-        use_rl_scores: bool = True
+        use_rl_scores: bool = True,
+        candidate_matrix: Optional[np.ndarray] = None,
+        history_matrix: Optional[np.ndarray] = None
     ) -> List[Tuple[Dict[str, Any], Dict[str, float]]]:
         """
         Rank candidate tracks and return top N recommendations.
@@ -402,37 +617,180 @@ class RecommendationScorer:
             personality_profile: User's Big Five scores
             max_results: Number of final recommendations (spec: 50)
             use_rl_scores: Whether to integrate RL scores
+            candidate_matrix: Prebuilt feature matrix for candidate_tracks
+            history_matrix: Prebuilt feature matrix for listening_history
             
         Returns:
-            List of (track, scores_dict) tuples, sorted by score
+            List of (track, scores_dict) tuples, best first in selection order
         """
-        scored_tracks = []
-        current_recommendations = []
+        n = len(candidate_tracks)
         
-        for candidate in candidate_tracks:
+        # History similarity for every candidate in one batched computation
+        if candidate_matrix is None:
+            candidate_matrix = self.build_feature_matrix(candidate_tracks)
+        if history_matrix is None:
+            history_matrix = self.build_feature_matrix(listening_history)
+        history_scores = self.batch_history_similarity(candidate_matrix, history_matrix)
+        personality_scores = self._safe_personality_scores(candidate_tracks, personality_profile, candidate_matrix)
+        
+        novelty_scores = np.empty(n, dtype=np.float32)
+        rl_scores = np.full(n, 0.5, dtype=np.float32)
+        rl_mask = np.zeros(n, dtype=bool)
+        
+        # History lookups are the same for every candidate
+        history_keys = self.history_keys(listening_history)
+        
+        for i, candidate in enumerate(candidate_tracks):
+            novelty_scores[i] = self.calculate_novelty_factor(candidate, listening_history, history_keys)
+            
             # Get RL score if available and enabled
             rl_score = candidate.get('rl_score') if use_rl_scores else None
-            
-            # Calculate composite score
-            scores = self.calculate_composite_score(
-                candidate,
-                listening_history,
-                personality_profile,
-                current_recommendations,
-                rl_score
+            if rl_score is not None:
+                rl_scores[i] = rl_score
+                rl_mask[i] = True
+        
+        k = min(max_results, n)
+        if k <= 0:
+            return []
+        
+        # Diversity depends on what has already been picked, so recommendations
+        # are selected greedily: each step takes the best final score given the
+        # tracks selected so far. Diversity adds at most its weight, so only
+        # candidates within that margin of the k-th best diversity-free score
+        # can ever win a slot.
+        score_floor = self.compose_scores(
+            history_scores, personality_scores, np.zeros(n, dtype=np.float32), novelty_scores, rl_scores, rl_mask
+        )
+        score_ceiling = self.compose_scores(
+            history_scores, personality_scores, np.ones(n, dtype=np.float32), novelty_scores, rl_scores, rl_mask
+        )
+        kth_floor = score_floor[self._top_k(score_floor, k)[-1]]
+        pool = np.flatnonzero(score_ceiling >= kth_floor)
+        
+        pool_matrix = candidate_matrix[pool]
+        pool_artists = np.array([self._artist_key(candidate_tracks[i]) for i in pool], dtype=object)
+        new_artist = np.ones(len(pool), dtype=bool)
+        available = np.ones(len(pool), dtype=bool)
+        selected_sum = np.zeros(candidate_matrix.shape[1], dtype=np.float32)
+        
+        ranked = []
+        for selected_count in range(k):
+            diversity_scores = self.batch_diversity_bonus(pool_matrix, selected_sum, selected_count, new_artist)
+            final_scores = self.compose_scores(
+                history_scores[pool], personality_scores[pool], diversity_scores,
+                novelty_scores[pool], rl_scores[pool], rl_mask[pool]
             )
+            final_scores[~available] = -np.inf
+            
+            # argmax takes the earliest candidate on ties
+            j = int(np.argmax(final_scores))
+            i = pool[j]
+            ranked.append((candidate_tracks[i], {
+                'final_score': float(final_scores[j]),
+                'history_similarity': float(history_scores[i]),
+                'personality_match': float(personality_scores[i]),
+                'diversity_bonus': float(diversity_scores[j]),
+                'novelty_factor': float(novelty_scores[i]),
+                'rl_score': float(rl_scores[i]) if rl_mask[i] else None,
+                'rl_adjusted': bool(rl_mask[i])
+            }))
+            
+            available[j] = False
+            selected_sum += pool_matrix[j]
+            new_artist &= pool_artists != pool_artists[j]
+        
+        return ranked
+    
+    async def rank_candidates_async(
+        self,
+        candidate_tracks: List[Dict[str, Any]],
+        listening_history: List[Dict[str, Any]],
+        personality_profile: Dict[PersonalityTrait, float],
+        **kwargs
+    ) -> List[Tuple[Dict[str, Any], Dict[str, float]]]:
+        """
+        Run rank_candidates on the scorer thread without blocking the event loop.
+        
+        Args:
+            candidate_tracks: List of 200-500 candidate tracks
+            listening_history: User's top 50 listening history
+            personality_profile: User's Big Five scores
+            **kwargs: Additional rank_candidates arguments
             
-            scored_tracks.append((candidate, scores))
+        Returns:
+            List of (track, scores_dict) tuples, best first in selection order
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _scorer_executor,
+            partial(self.rank_candidates, candidate_tracks, listening_history, personality_profile, **kwargs)
+        )
+    
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        Indices of the k highest scores, best first, without sorting all of them.
+        Ties are broken by index, matching a stable descending sort.
+        
+        Args:
+            scores: (N,) scores
+            k: Number of indices to return
+            
+        Returns:
+            Up to k indices into scores
+        """
+        n = scores.shape[0]
+        k = min(k, n)
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        
+        if k < n:
+            # O(N) partition to find the k-th best score, then take everything
+            # above it plus the earliest candidates tied with it
+            kth_score = scores[np.argpartition(-scores, k - 1)[k - 1]]
+            above = np.flatnonzero(scores > kth_score)
+            tied = np.flatnonzero(scores == kth_score)[:k - len(above)]
+            idx = np.concatenate((above, tied))
+        else:
+            idx = np.arange(n)
+        
+        # Sort only the survivors: by score descending, then index
+        return idx[np.lexsort((idx, -scores[idx]))]
+    
+    def compose_scores(
+        self,
+        history_scores: np.ndarray,
+        personality_scores: np.ndarray,
+        diversity_scores: np.ndarray,
+        novelty_scores: np.ndarray,
+        rl_scores: np.ndarray,
+        rl_mask: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized form of the calculate_composite_score weighted sum.
+        
+        Args:
+            history_scores: (N,) history similarity
+            personality_scores: (N,) personality match
+            diversity_scores: (N,) diversity bonus
+            novelty_scores: (N,) novelty factor
+            rl_scores: (N,) RL scores (ignored where rl_mask is False)
+            rl_mask: (N,) whether each candidate has an RL score
             
-            # Add to current recommendations for diversity calculation
-            if len(current_recommendations) < max_results:
-                current_recommendations.append(candidate)
+        Returns:
+            (N,) final scores [0, 1]
+        """
+        weighted = (
+            self.WEIGHTS['history_similarity'] * history_scores +
+            self.WEIGHTS['personality_match'] * personality_scores +
+            self.WEIGHTS['diversity_bonus'] * diversity_scores +
+            self.WEIGHTS['novelty_factor'] * novelty_scores
+        )
         
-        # Sort by final score
-        scored_tracks.sort(key=lambda x: x[1]['final_score'], reverse=True)
+        # RL adjustment (±0.05) only where an RL score exists
+        weighted += np.where(rl_mask, (rl_scores - 0.5) * 0.1, np.float32(0.0))
         
-        # Return top N
-        return scored_tracks[:max_results]
+        return np.clip(weighted, 0, 1)
 
 
 # Global scorer instance
@@ -8,21 +8,179 @@ Cache TTL Configuration (per spec):
 - API responses: 6 hours
 """
 
+import asyncio
 import redis
+import redis.asyncio as aioredis
+from redis.cache import CacheConfig
+from redis.utils import HIREDIS_AVAILABLE
 import json
+import orjson
+import ormsgpack
 import logging
-import pickle
-from typing import Any, Optional, Dict
+import secrets
+import socket
+import threading
+import time
+import weakref
+import zstandard
+from functools import lru_cache
+from itertools import islice
+from typing import Any, AsyncIterator, Optional, Dict, List, Tuple
 from datetime import timedelta
 from core.config import get_config
 
 logger = logging.getLogger("bondhu.redis_cache")
 
+# One-byte format header prepended to JSON payloads. Entries written before
+# the header existed are plain UTF-8 JSON and are still readable.
+_FORMAT_ORJSON = b'\x01'
+_FORMAT_ORJSON_ZSTD = b'\x02'
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Non-JSON values are stored as tagged msgpack (smaller and faster than
+# pickle, and decoding untrusted bytes can't execute code)
+_FORMAT_MSGPACK = b'\x03'
+_MSGPACK_OPTIONS = ormsgpack.OPT_NON_STR_KEYS | ormsgpack.OPT_SERIALIZE_NUMPY
+
+# JSON payloads above this size are zstd-compressed (track lists compress 3-5x)
+COMPRESS_MIN_BYTES = 4096
+ZSTD_LEVEL = 3
+
+# zstd (de)compressor objects can't be shared between threads
+_zstd_local = threading.local()
+
+
+def _format_key(prefix: str, args: tuple, kwitems) -> str:
+    key_parts = [prefix]
+    key_parts.extend(str(arg) for arg in args)
+    key_parts.extend(f"{k}={v}" for k, v in sorted(kwitems))
+    return ":".join(key_parts)
+
+
+@lru_cache(maxsize=16384)
+def _build_key(prefix: str, args: tuple, kwitems: tuple) -> str:
+    """Memoized _format_key for string key components."""
+    return _format_key(prefix, args, kwitems)
+
+
+def _zstd_compressor() -> zstandard.ZstdCompressor:
+    compressor = getattr(_zstd_local, 'compressor', None)
+    if compressor is None:
+        compressor = _zstd_local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return compressor
+
+
+def _zstd_decompressor() -> zstandard.ZstdDecompressor:
+    decompressor = getattr(_zstd_local, 'decompressor', None)
+    if decompressor is None:
+        decompressor = _zstd_local.decompressor = zstandard.ZstdDecompressor()
+    return decompressor
+
+# Keys fetched per SCAN call and unlinked per command in invalidate_pattern
+SCAN_BATCH_SIZE = 500
+
+# redis-py picks the C reply parser automatically when hiredis is installed
+REPLY_PARSER = 'hiredis' if HIREDIS_AVAILABLE else 'python'
+
+# Keep pooled connections alive through NATs/load balancers and verify idle
+# ones before reuse, so a dead socket doesn't stall the next request
+HEALTH_CHECK_INTERVAL = 30
+_KEEPALIVE_OPTIONS = {
+    option: value
+    for name, value in (('TCP_KEEPIDLE', 30), ('TCP_KEEPINTVL', 10), ('TCP_KEEPCNT', 3))
+    if (option := getattr(socket, name, None)) is not None
+}
+_CONNECTION_HEALTH_KWARGS = {
+    'socket_keepalive': True,
+    'socket_keepalive_options': _KEEPALIVE_OPTIONS,
+    'health_check_interval': HEALTH_CHECK_INTERVAL,
+}
+
+# Atomic INCRBY that starts the expiry when the counter has none (new key),
+# so fixed-window counters need one round-trip and can't be left immortal
+INCREMENT_WITH_TTL_LUA = """
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if redis.call('TTL', KEYS[1]) == -1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return value
+"""
+
+# GET that also counts the hit/miss in a shared stats hash, in the same
+# round-trip, so hit rates can be aggregated across all worker processes
+GET_WITH_STATS_LUA = """
+local value = redis.call('GET', KEYS[1])
+redis.call('HINCRBY', KEYS[2], value and 'hits' or 'misses', 1)
+return value
+"""
+SHARED_STATS_KEY_PREFIX = "cache_stats:"
+
+# Lock release and renewal that only act while the caller's owner token is still
+# stored, so a holder whose lock expired can't drop or extend another's lock
+RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+EXTEND_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Server INFO is reused for this long so frequent metrics scrapes don't make
+# Redis build and send the stats/memory sections on every call
+INFO_CACHE_TTL = 5.0
+
+
+class CacheStats:
+    """
+    Cache hit/miss counters kept per thread and summed on read.
+    
+    Each thread only ever writes its own dict, so counting needs no lock and
+    concurrent increments can't be lost; the lock is taken once per thread.
+    """
+    
+    FIELDS = ('hits', 'misses', 'sets', 'deletes', 'errors')
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Every thread's counters, including exited threads (their counts still count)
+        self._counters: List[Dict[str, int]] = []
+    
+    def _thread_counters(self) -> Dict[str, int]:
+        counters = getattr(self._local, 'counters', None)
+        if counters is None:
+            counters = dict.fromkeys(self.FIELDS, 0)
+            with self._lock:
+                self._counters.append(counters)
+            self._local.counters = counters
+        return counters
+    
+    def incr(self, field: str, amount: int = 1) -> None:
+        """Add amount to a counter for the current thread."""
+        self._thread_counters()[field] += amount
+    
+    def __getitem__(self, field: str) -> int:
+        with self._lock:
+            counters = list(self._counters)
+        return sum(c[field] for c in counters)
+    
+    def snapshot(self) -> Dict[str, int]:
+        """Totals for all counters."""
+        return {field: self[field] for field in self.FIELDS}
+    
+    def __repr__(self) -> str:
+        return f"CacheStats({self.snapshot()})"
+
 
 class RedisCache:
     """
     Redis-based cache with automatic serialization and TTL management.
-    Supports both JSON and pickle serialization for flexibility.
+    Supports both JSON and msgpack serialization for flexibility.
     """
     
     def __init__(
@@ -35,6 +193,10 @@ class RedisCache:
         socket_timeout: int = 5,
         socket_connect_timeout: int = 5,
         decode_responses: bool = False,  # We'll handle encoding ourselves
+        client_cache_size: int = 0,
+        key_prefix: str = '',
+        pool: Optional[redis.ConnectionPool] = None,
+        shared_stats: bool = False,
     ):
         """
         Initialize Redis cache with connection pooling.
@@ -48,7 +210,59 @@ class RedisCache:
             socket_timeout: Socket timeout in seconds
             socket_connect_timeout: Connection timeout in seconds
             decode_responses: Auto-decode responses (we handle manually)
+            client_cache_size: Max keys kept in a process-local cache of reads
+                (0 = disabled). Uses RESP3 client tracking, so the server
+                invalidates entries when keys change; for read-mostly caches.
+            key_prefix: Namespace prepended to every key (e.g. 'rec')
+            pool: Existing connection pool to share instead of creating one
+                (connection arguments are then ignored)
+            shared_stats: Also count get() hits/misses in a Redis hash shared
+                by all processes (folded into the GET round-trip)
         """
+        # Caches sharing a pool (and database) are kept apart by key prefix
+        self.key_prefix = key_prefix
+        self._prefix = f"{key_prefix}:" if key_prefix else ''
+        
+        # Cache hit/miss statistics
+        self.stats = CacheStats()
+        
+        if pool is not None:
+            self.pool = pool
+            self.client = redis.Redis(connection_pool=pool)
+        else:
+            self._connect(host, port, db, password, max_connections, socket_timeout,
+                          socket_connect_timeout, decode_responses, client_cache_size)
+        
+        # Loaded on first use and run via EVALSHA (reloaded if the script cache is flushed)
+        self._increment_with_ttl = self.client.register_script(INCREMENT_WITH_TTL_LUA)
+        
+        self.shared_stats = shared_stats
+        self._shared_stats_key = SHARED_STATS_KEY_PREFIX + (key_prefix or 'default')
+        self._get_with_stats = self.client.register_script(GET_WITH_STATS_LUA)
+        self._release_lock = self.client.register_script(RELEASE_LOCK_LUA)
+        self._extend_lock = self.client.register_script(EXTEND_LOCK_LUA)
+        
+        # (monotonic timestamp, stats info, memory info) from the last INFO refresh
+        self._info_cache: Optional[Tuple[float, Dict[str, Any], Dict[str, Any]]] = None
+    
+    def _connect(
+        self,
+        host: Optional[str],
+        port: Optional[int],
+        db: int,
+        password: Optional[str],
+        max_connections: int,
+        socket_timeout: int,
+        socket_connect_timeout: int,
+        decode_responses: bool,
+        client_cache_size: int,
+    ) -> None:
+        """Create this cache's connection pool and client (see __init__ for args)."""
+        # Client-side caching needs RESP3; redis-py handles tracking/invalidation
+        cache_kwargs = {}
+        if client_cache_size:
+            cache_kwargs = {'protocol': 3, 'cache_config': CacheConfig(max_size=client_cache_size)}
+        
         try:
             config = get_config()
             
@@ -68,13 +282,15 @@ class RedisCache:
                 socket_timeout=socket_timeout,
                 socket_connect_timeout=socket_connect_timeout,
                 decode_responses=decode_responses,
+                **cache_kwargs,
+                **_CONNECTION_HEALTH_KWARGS,
             )
             
             self.client = redis.Redis(connection_pool=self.pool)
             
             # Test connection
             self.client.ping()
-            logger.info(f"✅ Connected to Redis at {self.host}:{self.port} (pool size: {max_connections})")
+            logger.info(f"✅ Connected to Redis at {self.host}:{self.port} (pool size: {max_connections}, parser: {REPLY_PARSER})")
             
         except redis.ConnectionError as e:
             logger.error(f"❌ Failed to connect to Redis at {self.host}:{self.port}: {e}")
@@ -90,6 +306,8 @@ class RedisCache:
                 db=db,
                 max_connections=max_connections,
                 decode_responses=decode_responses,
+                **cache_kwargs,
+                **_CONNECTION_HEALTH_KWARGS,
             )
             self.client = redis.Redis(connection_pool=self.pool)
             
@@ -99,22 +317,52 @@ class RedisCache:
             except:
                 logger.error(f"❌ Failed to connect to fallback Redis at {fallback_host}:6379")
                 logger.warning("⚠️ Running without Redis cache - performance will be degraded")
-        
-        # Cache hit/miss statistics
-        self.stats = {
-            'hits': 0,
-            'misses': 0,
-            'sets': 0,
-            'deletes': 0,
-            'errors': 0
-        }
     
     def _make_key(self, prefix: str, *args, **kwargs) -> str:
         """Create cache key from arguments."""
-        key_parts = [prefix]
-        key_parts.extend(str(arg) for arg in args)
-        key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
-        return ":".join(key_parts)
+        prefix = self._prefix + prefix
+        if not args and not kwargs:
+            return prefix
+        # Memoize the common all-string shape; other values (1 == 1.0 == True)
+        # could share a memo entry while formatting differently
+        if all(type(arg) is str for arg in args) and all(type(v) is str for v in kwargs.values()):
+            return _build_key(prefix, args, tuple(kwargs.items()))
+        return _format_key(prefix, args, kwargs.items())
+    
+    @staticmethod
+    def _encode_json(value: Any) -> bytes:
+        """Serialize value to header-tagged orjson bytes, compressing large payloads."""
+        serialized = orjson.dumps(value, default=str, option=_ORJSON_OPTIONS)
+        if len(serialized) > COMPRESS_MIN_BYTES:
+            return _FORMAT_ORJSON_ZSTD + _zstd_compressor().compress(serialized)
+        return _FORMAT_ORJSON + serialized
+    
+    @staticmethod
+    def _decode_json(raw: bytes) -> Any:
+        """Deserialize a JSON payload, accepting legacy untagged entries."""
+        header = raw[:1]
+        if header == _FORMAT_ORJSON:
+            return orjson.loads(raw[1:])
+        if header == _FORMAT_ORJSON_ZSTD:
+            return orjson.loads(_zstd_decompressor().decompress(raw[1:]))
+        return json.loads(raw.decode('utf-8'))
+    
+    @staticmethod
+    def _encode_msgpack(value: Any) -> bytes:
+        """
+        Serialize value to header-tagged msgpack bytes.
+        
+        Types msgpack can't represent raise TypeError (so the write fails and is
+        logged) instead of being stored as strings that read back as a different type.
+        """
+        return _FORMAT_MSGPACK + ormsgpack.packb(value, option=_MSGPACK_OPTIONS)
+    
+    @staticmethod
+    def _decode_msgpack(raw: bytes) -> Any:
+        """Deserialize a msgpack payload (legacy pickle entries are rejected)."""
+        if raw[:1] != _FORMAT_MSGPACK:
+            raise ValueError("cached value is not msgpack-encoded")
+        return ormsgpack.unpackb(raw[1:], option=ormsgpack.OPT_NON_STR_KEYS)
     
     def get(self, prefix: str, *args, use_json: bool = True, **kwargs) -> Optional[Any]:
         """
@@ -122,7 +370,7 @@ class RedisCache:
         
         Args:
             prefix: Cache key prefix
-            use_json: Use JSON serialization (True) or pickle (False)
+            use_json: Use JSON serialization (True) or msgpack (False)
             *args, **kwargs: Additional key components
             
         Returns:
@@ -130,32 +378,35 @@ class RedisCache:
         """
         try:
             key = self._make_key(prefix, *args, **kwargs)
-            value = self.client.get(key)
+            if self.shared_stats:
+                value = self._get_with_stats(keys=[key, self._shared_stats_key])
+            else:
+                value = self.client.get(key)
             
             if value is None:
-                self.stats['misses'] += 1
+                self.stats.incr('misses')
                 return None
             
-            self.stats['hits'] += 1
+            self.stats.incr('hits')
             
             # Deserialize
             if use_json:
-                return json.loads(value.decode('utf-8'))
+                return self._decode_json(value)
             else:
-                return pickle.loads(value)
+                return self._decode_msgpack(value)
                 
         except Exception as e:
             logger.error(f"Redis get error for key {prefix}: {e}")
-            self.stats['errors'] += 1
+            self.stats.incr('errors')
             return None
     
     def set(
         self, 
         prefix: str, 
         value: Any, 
+        *args, 
         ttl: Optional[int] = None,
         use_json: bool = True,
-        *args, 
         **kwargs
     ) -> bool:
         """
@@ -164,9 +415,10 @@ class RedisCache:
         Args:
             prefix: Cache key prefix
             value: Value to cache
+            *args: Additional key components
             ttl: Time-to-live in seconds (None = no expiration)
-            use_json: Use JSON serialization (True) or pickle (False)
-            *args, **kwargs: Additional key components
+            use_json: Use JSON serialization (True) or msgpack (False)
+            **kwargs: Additional key components
             
         Returns:
             True if successful
@@ -176,23 +428,210 @@ class RedisCache:
             
             # Serialize
             if use_json:
-                serialized = json.dumps(value, default=str)
+                serialized = self._encode_json(value)
             else:
-                serialized = pickle.dumps(value)
+                serialized = self._encode_msgpack(value)
             
             # Set with optional TTL
+            return self.setex_raw(key, serialized, ttl)
+            
+        except Exception as e:
+            logger.error(f"Redis set error for key {prefix}: {e}")
+            self.stats.incr('errors')
+            return False
+    
+    def setex_raw(self, key: str, value: bytes, ttl: Optional[int]) -> bool:
+        """
+        Store an already-encoded payload under a full key.
+        Skips key building and serialization for callers that have both.
+        
+        Args:
+            key: Full cache key (as built by _make_key)
+            value: Encoded payload (e.g. from _encode_json)
+            ttl: Time-to-live in seconds (None = no expiration)
+            
+        Returns:
+            True if successful
+        """
+        try:
             if ttl:
-                self.client.setex(key, ttl, serialized)
+                self.client.setex(key, ttl, value)
             else:
-                self.client.set(key, serialized)
+                self.client.set(key, value)
             
-            self.stats['sets'] += 1
+            self.stats.incr('sets')
             return True
             
         except Exception as e:
-            logger.error(f"Redis set error for key {prefix}: {e}")
-            self.stats['errors'] += 1
+            logger.error(f"Redis set error for key {key}: {e}")
+            self.stats.incr('errors')
+            return False
+    
+    def mget(self, prefix: str, keys: List[Any], use_json: bool = True) -> List[Optional[Any]]:
+        """
+        Get many cached values with a single MGET.
+        
+        Args:
+            prefix: Cache key prefix
+            keys: Key components, one per value (combined with prefix)
+            use_json: Use JSON serialization (True) or msgpack (False)
+            
+        Returns:
+            Values in the order of keys, None where not found/expired
+        """
+        if not keys:
+            return []
+        
+        try:
+            raw_values = self.client.mget([self._make_key(prefix, key) for key in keys])
+            
+            decode = self._decode_json if use_json else self._decode_msgpack
+            values = [decode(raw) if raw is not None else None for raw in raw_values]
+            
+            hits = sum(1 for raw in raw_values if raw is not None)
+            self.stats.incr('hits', hits)
+            self.stats.incr('misses', len(raw_values) - hits)
+            return values
+            
+        except Exception as e:
+            logger.error(f"Redis mget error for prefix {prefix}: {e}")
+            self.stats.incr('errors')
+            return [None] * len(keys)
+    
+    def mset(
+        self,
+        prefix: str,
+        mapping: Dict[Any, Any],
+        ttl: Optional[int] = None,
+        use_json: bool = True
+    ) -> int:
+        """
+        Set many cached values with one pipelined batch.
+        
+        Args:
+            prefix: Cache key prefix
+            mapping: Key component -> value to cache
+            ttl: Time-to-live in seconds (None = no expiration)
+            use_json: Use JSON serialization (True) or msgpack (False)
+            
+        Returns:
+            Number of values written
+        """
+        return self.pipeline_set(
+            [(self._make_key(prefix, key), value, ttl) for key, value in mapping.items()],
+            use_json=use_json
+        )
+    
+    def hset_all(
+        self,
+        prefix: str,
+        mapping: Dict[str, Any],
+        *args,
+        ttl: Optional[int] = None,
+        use_json: bool = True,
+        **kwargs
+    ) -> bool:
+        """
+        Update fields of a hash of cached values atomically in one round-trip.
+        
+        Fields not in mapping keep their current values, so a partial refresh
+        never evicts good data. Suited to small groups that are always read
+        together (one HGETALL instead of a GET per member).
+        
+        Args:
+            prefix: Cache key prefix
+            mapping: Field -> value to cache
+            *args: Additional key components
+            ttl: Time-to-live in seconds for the whole hash (None = no expiration)
+            use_json: Use JSON serialization (True) or msgpack (False)
+            **kwargs: Additional key components
+            
+        Returns:
+            True if successful
+        """
+        if not mapping:
             return False
+        
+        try:
+            key = self._make_key(prefix, *args, **kwargs)
+            encode = self._encode_json if use_json else self._encode_msgpack
+            
+            # MULTI/EXEC so readers never see a half-updated hash
+            pipe = self.client.pipeline(transaction=True)
+            pipe.hset(key, mapping={field: encode(value) for field, value in mapping.items()})
+            if ttl:
+                pipe.expire(key, ttl)
+            pipe.execute()
+            
+            self.stats.incr('sets')
+            return True
+            
+        except Exception as e:
+            logger.error(f"Redis hash set error for key {prefix}: {e}")
+            self.stats.incr('errors')
+            return False
+    
+    def hget_all(self, prefix: str, *args, use_json: bool = True, **kwargs) -> Dict[str, Any]:
+        """
+        Get every field of a hash written with hset_all.
+        
+        Args:
+            prefix: Cache key prefix
+            *args: Additional key components
+            use_json: Use JSON serialization (True) or msgpack (False)
+            **kwargs: Additional key components
+            
+        Returns:
+            Field -> value mapping (empty if not found/expired)
+        """
+        try:
+            raw = self.client.hgetall(self._make_key(prefix, *args, **kwargs))
+            
+            if not raw:
+                self.stats.incr('misses')
+                return {}
+            
+            self.stats.incr('hits')
+            decode = self._decode_json if use_json else self._decode_msgpack
+            return {field.decode('utf-8'): decode(value) for field, value in raw.items()}
+            
+        except Exception as e:
+            logger.error(f"Redis hash get error for key {prefix}: {e}")
+            self.stats.incr('errors')
+            return {}
+    
+    def pipeline_set(self, items: List[Tuple[str, Any, Optional[int]]], use_json: bool = True) -> int:
+        """
+        Set many cached values in a single round-trip.
+        
+        Args:
+            items: (key, value, ttl) tuples; keys as built by _make_key,
+                ttl None = no expiration
+            use_json: Use JSON serialization (True) or msgpack (False)
+            
+        Returns:
+            Number of values written
+        """
+        if not items:
+            return 0
+        
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value, ttl in items:
+                serialized = self._encode_json(value) if use_json else self._encode_msgpack(value)
+                if ttl:
+                    pipe.setex(key, ttl, serialized)
+                else:
+                    pipe.set(key, serialized)
+            
+            written = sum(1 for ok in pipe.execute() if ok)
+            self.stats.incr('sets', written)
+            return written
+            
+        except Exception as e:
+            logger.error(f"Redis pipelined set error for {len(items)} keys: {e}")
+            self.stats.incr('errors')
+            return 0
     
     def delete(self, prefix: str, *args, **kwargs) -> bool:
         """
@@ -207,18 +646,19 @@ class RedisCache:
         """
         try:
             key = self._make_key(prefix, *args, **kwargs)
-            deleted = self.client.delete(key)
-            self.stats['deletes'] += 1
+            # UNLINK frees the value on a Redis background thread
+            deleted = self.client.unlink(key)
+            self.stats.incr('deletes')
             return bool(deleted)
             
         except Exception as e:
             logger.error(f"Redis delete error for key {prefix}: {e}")
-            self.stats['errors'] += 1
+            self.stats.incr('errors')
             return False
     
     def invalidate_pattern(self, pattern: str) -> int:
         """
-        Invalidate all keys matching pattern.
+        Invalidate all keys matching pattern within this cache's key prefix.
         
         Args:
             pattern: Redis key pattern (e.g., "user:123:*")
@@ -227,18 +667,68 @@ class RedisCache:
             Number of keys deleted
         """
         try:
-            keys = self.client.keys(pattern)
-            if keys:
-                deleted = self.client.delete(*keys)
-                self.stats['deletes'] += deleted
-                return deleted
-            return 0
+            # Incremental SCAN instead of KEYS so Redis isn't blocked for the
+            # whole keyspace walk; UNLINK frees values off the main thread
+            deleted = 0
+            keys = self.client.scan_iter(match=self._prefix + pattern, count=SCAN_BATCH_SIZE)
+            while batch := list(islice(keys, SCAN_BATCH_SIZE)):
+                deleted += self.client.unlink(*batch)
+            
+            self.stats.incr('deletes', deleted)
+            return deleted
             
         except Exception as e:
             logger.error(f"Redis pattern invalidation error: {e}")
-            self.stats['errors'] += 1
+            self.stats.incr('errors')
             return 0
     
+    def acquire_lock(self, prefix: str, ttl: int = 30, *args, **kwargs) -> Optional[str]:
+        """
+        Try to take a short-lived lock (SET NX EX) under a random owner token.
+        
+        Args:
+            prefix: Cache key prefix
+            ttl: Lock expiry in seconds, so a crashed holder can't block forever
+            *args, **kwargs: Additional key components
+            
+        Returns:
+            Owner token to pass to extend_lock/release_lock if the lock was
+            acquired (or Redis is unavailable), else None
+        """
+        token = secrets.token_hex(16)
+        try:
+            key = self._make_key(prefix, *args, **kwargs)
+            return token if self.client.set(key, token, nx=True, ex=ttl) else None
+        except Exception as e:
+            logger.error(f"Redis lock error for key {prefix}: {e}")
+            self.stats.incr('errors')
+            # Fail open so callers still make progress without Redis
+            return token
+    
+    def extend_lock(self, prefix: str, token: str, ttl: int = 30, *args, **kwargs) -> bool:
+        """
+        Reset the expiry of a lock still held under token.
+        
+        Returns:
+            True if the lock was still ours and was extended
+        """
+        try:
+            key = self._make_key(prefix, *args, **kwargs)
+            return bool(self._extend_lock(keys=[key], args=[token, ttl]))
+        except Exception as e:
+            logger.error(f"Redis lock extend error for key {prefix}: {e}")
+            self.stats.incr('errors')
+            return False
+    
+    def release_lock(self, prefix: str, token: str, *args, **kwargs) -> None:
+        """Release a lock taken with acquire_lock, unless it has passed to another owner."""
+        try:
+            key = self._make_key(prefix, *args, **kwargs)
+            self._release_lock(keys=[key], args=[token])
+        except Exception as e:
+            logger.error(f"Redis lock release error for key {prefix}: {e}")
+            self.stats.incr('errors')
+    
     def exists(self, prefix: str, *args, **kwargs) -> bool:
         """Check if key exists."""
         try:
@@ -280,47 +770,99 @@ class RedisCache:
             logger.error(f"Redis increment error: {e}")
             return 0
     
+    def increment_with_ttl(self, prefix: str, ttl: int, amount: int = 1, *args, **kwargs) -> int:
+        """
+        Increment an expiring counter atomically in one round-trip.
+        
+        Args:
+            prefix: Cache key prefix
+            ttl: Expiry in seconds, set when the counter is created
+            amount: Amount to increment by
+            *args, **kwargs: Additional key components
+            
+        Returns:
+            New value after increment
+        """
+        try:
+            key = self._make_key(prefix, *args, **kwargs)
+            return int(self._increment_with_ttl(keys=[key], args=[amount, ttl]))
+        except Exception as e:
+            logger.error(f"Redis increment with TTL error: {e}")
+            self.stats.incr('errors')
+            return 0
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        total_requests = self.stats['hits'] + self.stats['misses']
-        hit_rate = (self.stats['hits'] / total_requests * 100) if total_requests > 0 else 0
+        stats = self.stats.snapshot()
+        total_requests = stats['hits'] + stats['misses']
+        hit_rate = (stats['hits'] / total_requests * 100) if total_requests > 0 else 0
         
         try:
             # Get Redis server info
-            info = self.client.info('stats')
-            memory_info = self.client.info('memory')
+            info, memory_info = self._get_server_info()
             
             return {
-                'cache_hits': self.stats['hits'],
-                'cache_misses': self.stats['misses'],
-                'cache_sets': self.stats['sets'],
-                'cache_deletes': self.stats['deletes'],
-                'cache_errors': self.stats['errors'],
+                'cache_hits': stats['hits'],
+                'cache_misses': stats['misses'],
+                'cache_sets': stats['sets'],
+                'cache_deletes': stats['deletes'],
+                'cache_errors': stats['errors'],
                 'hit_rate_percent': round(hit_rate, 2),
                 'total_requests': total_requests,
                 'redis_connected_clients': info.get('connected_clients', 0),
                 'redis_total_commands': info.get('total_commands_processed', 0),
                 'redis_memory_used_mb': round(memory_info.get('used_memory', 0) / 1024 / 1024, 2),
                 'redis_memory_peak_mb': round(memory_info.get('used_memory_peak', 0) / 1024 / 1024, 2),
+                **self._get_shared_stats(),
             }
         except Exception as e:
             logger.error(f"Failed to get Redis stats: {e}")
             return {
-                'cache_hits': self.stats['hits'],
-                'cache_misses': self.stats['misses'],
+                'cache_hits': stats['hits'],
+                'cache_misses': stats['misses'],
                 'hit_rate_percent': round(hit_rate, 2),
                 'error': str(e)
             }
     
+    def _get_server_info(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Stats and memory INFO sections, refreshed at most every INFO_CACHE_TTL seconds."""
+        cached = self._info_cache
+        if cached is not None and time.monotonic() - cached[0] < INFO_CACHE_TTL:
+            return cached[1], cached[2]
+        
+        # Both sections in one round-trip
+        pipe = self.client.pipeline(transaction=False)
+        pipe.info('stats')
+        pipe.info('memory')
+        info, memory_info = pipe.execute()
+        
+        self._info_cache = (time.monotonic(), info, memory_info)
+        return info, memory_info
+    
+    def _get_shared_stats(self) -> Dict[str, int]:
+        """Hit/miss totals across all processes (empty unless shared_stats is on)."""
+        if not self.shared_stats:
+            return {}
+        shared = self.client.hgetall(self._shared_stats_key)
+        return {
+            'shared_cache_hits': int(shared.get(b'hits', 0)),
+            'shared_cache_misses': int(shared.get(b'misses', 0)),
+        }
+    
     def clear_all(self) -> bool:
         """
         Clear all cache entries (use with caution!).
+        Namespaced caches only clear their own keys; the database is shared.
         
         Returns:
             True if successful
         """
         try:
-            self.client.flushdb()
+            if self._prefix:
+                self.invalidate_pattern('*')
+            else:
+                # ASYNC so a large keyspace doesn't block Redis while it frees
+                self.client.flushdb(asynchronous=True)
             logger.warning("Redis cache cleared completely")
             return True
         except Exception as e:
@@ -336,21 +878,373 @@ class RedisCache:
             logger.error(f"Error closing Redis connection: {e}")
 
 
-# Global cache instances with TTL per spec
+async def _close_on_loop_shutdown(client: aioredis.Redis) -> AsyncIterator[None]:
+    """
+    Park until the owning event loop shuts down, then close the client's pool.
+    
+    asyncio.run() closes live async generators before it closes the loop, which
+    is the last point the pool's connections can still be closed on that loop.
+    """
+    try:
+        yield
+    finally:
+        try:
+            await client.aclose(close_connection_pool=True)
+        except Exception as e:
+            logger.debug(f"Error closing async Redis pool on loop shutdown: {e}")
+
+
+class AsyncRedisCache:
+    """
+    Awaitable counterpart of RedisCache for async handlers.
+    Uses the same key layout and serialization, so both can share a database.
+    """
+    
+    # Key building and (de)serialization are shared with the sync cache
+    _make_key = RedisCache._make_key
+    _encode_json = staticmethod(RedisCache._encode_json)
+    _decode_json = staticmethod(RedisCache._decode_json)
+    _encode_msgpack = staticmethod(RedisCache._encode_msgpack)
+    _decode_msgpack = staticmethod(RedisCache._decode_msgpack)
+    
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        db: int = 0,
+        password: Optional[str] = None,
+        max_connections: int = 100,
+        socket_timeout: int = 5,
+        socket_connect_timeout: int = 5,
+        key_prefix: str = '',
+    ):
+        """
+        Initialize async Redis cache. Connections are opened on first use.
+        
+        Args:
+            host: Redis host (default from config)
+            port: Redis port (default from config)
+            db: Redis database number
+            password: Redis password
+            max_connections: Max connections in pool
+            socket_timeout: Socket timeout in seconds
+            socket_connect_timeout: Connection timeout in seconds
+            key_prefix: Namespace prepended to every key (as in RedisCache)
+        """
+        self.key_prefix = key_prefix
+        self._prefix = f"{key_prefix}:" if key_prefix else ''
+        
+        config = get_config()
+        self._pool_kwargs = dict(
+            host=host or config.redis.host,
+            port=port or config.redis.port,
+            db=db,
+            password=password or config.redis.password,
+            max_connections=max_connections,
+            socket_timeout=socket_timeout,
+            socket_connect_timeout=socket_connect_timeout,
+            **_CONNECTION_HEALTH_KWARGS,
+        )
+        # Event loop -> (client, pool closer); entries go away with their loop
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[aioredis.Redis, AsyncIterator[None]]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        
+        self.stats = CacheStats()
+    
+    @property
+    def client(self) -> aioredis.Redis:
+        """
+        Client bound to the running event loop.
+        
+        Async connections can't cross event loops, so each loop gets its own
+        pool (e.g. successive asyncio.run calls in Celery workers). A pool is
+        disconnected on its own loop when that loop shuts down, and dropped
+        once the loop is closed.
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(loop)
+        if entry is None:
+            # Pools of loops closed without an asyncio.run shutdown can no longer
+            # be disconnected; forget them so their sockets are reclaimed
+            for closed_loop in [other for other in self._clients if other.is_closed()]:
+                del self._clients[closed_loop]
+            
+            client = aioredis.Redis(connection_pool=aioredis.ConnectionPool(**self._pool_kwargs))
+            closer = _close_on_loop_shutdown(client)
+            # Start the closer so the loop tracks it for shutdown_asyncgens()
+            asyncio.ensure_future(closer.__anext__())
+            entry = self._clients[loop] = (client, closer)
+        return entry[0]
+    
+    async def get(self, prefix: str, *args, use_json: bool = True, **kwargs) -> Optional[Any]:
+        """
+        Get cached value.
+        
+        Args:
+            prefix: Cache key prefix
+            use_json: Use JSON serialization (True) or msgpack (False)
+            *args, **kwargs: Additional key components
+            
+        Returns:
+            Cached value or None if not found/expired
+        """
+        try:
+            value = await self.client.get(self._make_key(prefix, *args, **kwargs))
+            
+            if value is None:
+                self.stats.incr('misses')
+                return None
+            
+            self.stats.incr('hits')
+            return self._decode_json(value) if use_json else self._decode_msgpack(value)
+            
+        except Exception as e:
+            logger.error(f"Redis get error for key {prefix}: {e}")
+            self.stats.incr('errors')
+            return None
+    
+    async def set(
+        self,
+        prefix: str,
+        value: Any,
+        *args,
+        ttl: Optional[int] = None,
+        use_json: bool = True,
+        **kwargs
+    ) -> bool:
+        """
+        Set cached value with TTL.
+        
+        Args:
+            prefix: Cache key prefix
+            value: Value to cache
+            *args: Additional key components
+            ttl: Time-to-live in seconds (None = no expiration)
+            use_json: Use JSON serialization (True) or msgpack (False)
+            **kwargs: Additional key components
+            
+        Returns:
+            True if successful
+        """
+        try:
+            key = self._make_key(prefix, *args, **kwargs)
+            serialized = self._encode_json(value) if use_json else self._encode_msgpack(value)
+            
+            if ttl:
+                await self.client.setex(key, ttl, serialized)
+            else:
+                await self.client.set(key, serialized)
+            
+            self.stats.incr('sets')
+            return True
+            
+        except Exception as e:
+            logger.error(f"Redis set error for key {prefix}: {e}")
+            self.stats.incr('errors')
+            return False
+    
+    async def mget(self, prefix: str, keys: List[Any], use_json: bool = True) -> List[Optional[Any]]:
+        """
+        Get many cached values with a single MGET.
+        
+        Args:
+            prefix: Cache key prefix
+            keys: Key components, one per value (combined with prefix)
+            use_json: Use JSON serialization (True) or msgpack (False)
+            
+        Returns:
+            Values in the order of keys, None where not found/expired
+        """
+        if not keys:
+            return []
+        
+        try:
+            raw_values = await self.client.mget([self._make_key(prefix, key) for key in keys])
+            
+            decode = self._decode_json if use_json else self._decode_msgpack
+            values = [decode(raw) if raw is not None else None for raw in raw_values]
+            
+            hits = sum(1 for raw in raw_values if raw is not None)
+            self.stats.incr('hits', hits)
+            self.stats.incr('misses', len(raw_values) - hits)
+            return values
+            
+        except Exception as e:
+            logger.error(f"Redis mget error for prefix {prefix}: {e}")
+            self.stats.incr('errors')
+            return [None] * len(keys)
+    
+    async def mset(
+        self,
+        prefix: str,
+        mapping: Dict[Any, Any],
+        ttl: Optional[int] = None,
+        use_json: bool = True
+    ) -> int:
+        """
+        Set many cached values with one pipelined batch.
+        
+        Args:
+            prefix: Cache key prefix
+            mapping: Key component -> value to cache
+            ttl: Time-to-live in seconds (None = no expiration)
+            use_json: Use JSON serialization (True) or msgpack (False)
+            
+        Returns:
+            Number of values written
+        """
+        if not mapping:
+            return 0
+        
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in mapping.items():
+                serialized = self._encode_json(value) if use_json else self._encode_msgpack(value)
+                if ttl:
+                    pipe.setex(self._make_key(prefix, key), ttl, serialized)
+                else:
+                    pipe.set(self._make_key(prefix, key), serialized)
+            
+            written = sum(1 for ok in await pipe.execute() if ok)
+            self.stats.incr('sets', written)
+            return written
+            
+        except Exception as e:
+            logger.error(f"Redis mset error for prefix {prefix}: {e}")
+            self.stats.incr('errors')
+            return 0
+    
+    async def delete(self, prefix: str, *args, **kwargs) -> bool:
+        """
+        Delete cached value.
+        
+        Args:
+            prefix: Cache key prefix
+            *args, **kwargs: Additional key components
+            
+        Returns:
+            True if deleted
+        """
+        try:
+            deleted = await self.client.unlink(self._make_key(prefix, *args, **kwargs))
+            self.stats.incr('deletes')
+            return bool(deleted)
+            
+        except Exception as e:
+            logger.error(f"Redis delete error for key {prefix}: {e}")
+            self.stats.incr('errors')
+            return False
+    
+    async def invalidate_pattern(self, pattern: str) -> int:
+        """
+        Invalidate all keys matching pattern within this cache's key prefix.
+        
+        Args:
+            pattern: Redis key pattern (e.g., "user:123:*")
+            
+        Returns:
+            Number of keys deleted
+        """
+        try:
+            deleted = 0
+            batch = []
+            async for key in self.client.scan_iter(match=self._prefix + pattern, count=SCAN_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) >= SCAN_BATCH_SIZE:
+                    deleted += await self.client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await self.client.unlink(*batch)
+            
+            self.stats.incr('deletes', deleted)
+            return deleted
+            
+        except Exception as e:
+            logger.error(f"Redis pattern invalidation error: {e}")
+            self.stats.incr('errors')
+            return 0
+    
+    async def exists(self, prefix: str, *args, **kwargs) -> bool:
+        """Check if key exists."""
+        try:
+            return bool(await self.client.exists(self._make_key(prefix, *args, **kwargs)))
+        except Exception as e:
+            logger.error(f"Redis exists check error: {e}")
+            return False
+    
+    async def acquire_lock(self, prefix: str, ttl: int = 30, *args, **kwargs) -> Optional[str]:
+        """
+        Try to take a short-lived lock (SET NX EX) under a random owner token.
+        
+        Args:
+            prefix: Cache key prefix
+            ttl: Lock expiry in seconds, so a crashed holder can't block forever
+            *args, **kwargs: Additional key components
+            
+        Returns:
+            Owner token to pass to extend_lock/release_lock if the lock was
+            acquired (or Redis is unavailable), else None
+        """
+        token = secrets.token_hex(16)
+        try:
+            key = self._make_key(prefix, *args, **kwargs)
+            return token if await self.client.set(key, token, nx=True, ex=ttl) else None
+        except Exception as e:
+            logger.error(f"Redis lock error for key {prefix}: {e}")
+            self.stats.incr('errors')
+            # Fail open so callers still make progress without Redis
+            return token
+    
+    async def extend_lock(self, prefix: str, token: str, ttl: int = 30, *args, **kwargs) -> bool:
+        """
+        Reset the expiry of a lock still held under token.
+        
+        Returns:
+            True if the lock was still ours and was extended
+        """
+        try:
+            key = self._make_key(prefix, *args, **kwargs)
+            # Scripts are bound to a client, and clients to an event loop
+            extend = self.client.register_script(EXTEND_LOCK_LUA)
+            return bool(await extend(keys=[key], args=[token, ttl]))
+        except Exception as e:
+            logger.error(f"Redis lock extend error for key {prefix}: {e}")
+            self.stats.incr('errors')
+            return False
+    
+    async def release_lock(self, prefix: str, token: str, *args, **kwargs) -> None:
+        """Release a lock taken with acquire_lock, unless it has passed to another owner."""
+        try:
+            key = self._make_key(prefix, *args, **kwargs)
+            release = self.client.register_script(RELEASE_LOCK_LUA)
+            await release(keys=[key], args=[token])
+        except Exception as e:
+            logger.error(f"Redis lock release error for key {prefix}: {e}")
+            self.stats.incr('errors')
+
+
+# Global cache instances with TTL per spec. All caches live in one database,
+# namespaced by key prefix; caches with the same connection needs share a pool
 # Recommendations cache: 24 hours
-recommendations_cache = RedisCache(db=0)
+recommendations_cache = RedisCache(key_prefix='rec', shared_stats=True)
+async_recommendations_cache = AsyncRedisCache(key_prefix='rec')
 RECOMMENDATIONS_TTL = 86400  # 24 hours
 
+# Audio features and API responses are read far more than written, so hot
+# keys are also served from a local cache kept coherent by client tracking
+CLIENT_CACHE_SIZE = 10000
+
 # Audio features cache: 7 days
-audio_features_cache = RedisCache(db=1)
+audio_features_cache = RedisCache(key_prefix='af', client_cache_size=CLIENT_CACHE_SIZE)
 AUDIO_FEATURES_TTL = 604800  # 7 days
 
 # API responses cache: 6 hours
-api_cache = RedisCache(db=2)
+api_cache = RedisCache(key_prefix='api', pool=audio_features_cache.pool)
 API_CACHE_TTL = 21600  # 6 hours
 
 # User data cache: 30 minutes (for frequently changing data)
-user_data_cache = RedisCache(db=3)
+user_data_cache = RedisCache(key_prefix='user', pool=recommendations_cache.pool, shared_stats=True)
 USER_DATA_TTL = 1800  # 30 minutes
 
 logger.info("Redis cache instances initialized with TTL configs per spec")
@@ -4,14 +4,19 @@ Background Tasks for Memory Management
 Handles periodic summarization of conversations and memory indexing.
 """
 
+import asyncio
 import logging
-from typing import Optional
+from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
 from core.memory.conversation_memory import get_conversation_memory_manager
 from core.memory.memory_index import get_memory_index_manager
+from core.config import get_config
 
 logger = logging.getLogger("bondhu.tasks.memory")
 
+# Rows deleted (and committed) per batch by cleanup_old_conversation_memories
+CLEANUP_BATCH_SIZE = 5000
+
 
 async def summarize_and_store_conversation(user_id: str, session_id: str) -> bool:
     """
@@ -76,10 +81,74 @@ async def summarize_and_store_conversation(user_id: str, session_id: str) -> boo
         return False
 
 
+async def summarize_sessions_bulk(sessions: List[Tuple[str, str]]) -> int:
+    """
+    Summarize many (user_id, session_id) pairs and store them in bulk.
+    
+    Sessions are summarized concurrently, then all memories are written with
+    one conversation_memories insert and one memory_index insert instead of
+    a round-trip pair per session. Intended for nightly batch summarization.
+    
+    Args:
+        sessions: (user_id, session_id) pairs to summarize
+        
+    Returns:
+        Number of conversation memories stored
+    """
+    try:
+        conversation_mgr = get_conversation_memory_manager()
+        index_mgr = get_memory_index_manager()
+        
+        # Map phase: summarization queries run in worker threads side by side
+        summaries = await asyncio.gather(*(
+            asyncio.to_thread(conversation_mgr.summarize_session, user_id, session_id)
+            for user_id, session_id in sessions
+        ))
+        
+        rows = []
+        index_entries = []
+        for (user_id, session_id), summary in zip(sessions, summaries):
+            if not summary:
+                logger.warning(f"No summary generated for session {session_id}")
+                continue
+            
+            rows.append(conversation_mgr.build_memory_row(
+                user_id=user_id,
+                conversation_summary=summary["conversation_summary"],
+                topics=summary["topics"],
+                emotions=summary["emotions"],
+                key_points=summary["key_points"],
+                session_id=session_id,
+                message_ids=summary["message_ids"],
+                start_time=summary["start_time"],
+                end_time=summary["end_time"],
+            ))
+            index_entries.append({
+                "user_id": user_id,
+                "session_id": session_id,
+                "topics": summary["topics"],
+                "timestamp": summary["end_time"],
+            })
+        
+        # Reduce phase: one insert per table for the whole batch
+        stored = await asyncio.to_thread(
+            conversation_mgr.create_conversation_memories_bulk, rows
+        )
+        if stored:
+            await asyncio.to_thread(index_mgr.index_conversations_bulk, index_entries)
+        
+        logger.info(f"Bulk summarized {stored} of {len(sessions)} sessions")
+        return stored
+        
+    except Exception as e:
+        logger.error(f"Error bulk summarizing conversations: {e}")
+        return 0
+
+
 async def cleanup_old_memories(days: int = 90) -> int:
     """
     Clean up very old conversation memories to save space.
-    Keeps only the most important ones.
+    Long-term facts in user_memories are kept.
     
     Args:
         days: Delete memories older than this many days
@@ -88,10 +157,28 @@ async def cleanup_old_memories(days: int = 90) -> int:
         Number of memories deleted
     """
     try:
-        # This would require admin access or service role key
-        # Implementation depends on retention policy
-        logger.info(f"Cleanup task: Would delete memories older than {days} days")
-        return 0
+        # Deletion runs inside Postgres in batches, each committed separately.
+        # That needs a CALL over a direct connection: PostgREST RPC can't run
+        # procedures that commit
+        postgres_url = get_config().database.postgres_url
+        if not postgres_url:
+            logger.error("Cleanup task needs DATABASE_URL (direct Postgres connection) - skipping")
+            return 0
+        
+        import asyncpg
+        
+        conn = await asyncpg.connect(postgres_url)
+        try:
+            deleted = await conn.fetchval(
+                "CALL public.cleanup_old_conversation_memories($1, $2, NULL)",
+                days, CLEANUP_BATCH_SIZE
+            )
+        finally:
+            await conn.close()
+        
+        deleted = deleted or 0
+        logger.info(f"Cleanup task: deleted {deleted} conversation memories older than {days} days")
+        return deleted
         
     except Exception as e:
         logger.error(f"Error cleaning up old memories: {e}")
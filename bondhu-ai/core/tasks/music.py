@@ -4,12 +4,62 @@ Focused on cache warming and bulk operations, not per-user scheduling
 """
 
 from celery import current_app as celery_app
-from core.services.rate_limiter import SpotifyRateLimiter
+from celery.schedules import crontab
+from typing import Dict, List, Any
 import asyncio
 import logging
 
+from core.services.redis_cache import recommendations_cache, RECOMMENDATIONS_TTL
+
 logger = logging.getLogger(__name__)
 
+# All 6 GenZ genres served by the music agent
+GENZ_GENRES = [
+    "Lo-fi Chill", "Pop Anthems", "Hype Beats", 
+    "Indie Vibes", "R&B Feels", "Sad Boy Hours"
+]
+
+# All genres live in one hash so readers fetch them with a single HGETALL
+GENRE_CACHE_PREFIX = "genres:popular"
+GENRE_CACHE_TRACKS = 20
+
+
+async def _fetch_genre_tracks(genres: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch popular tracks for each genre via the rate-limited Spotify service.
+    
+    Args:
+        genres: GenZ genre names
+        
+    Returns:
+        Mapping of genre to tracks (genres with no results are omitted)
+    """
+    from agents.music.music_agent import MusicIntelligenceAgent
+    
+    # No user token: the agent falls back to app credentials
+    agent = MusicIntelligenceAgent(user_id="genre-cache-warmer")
+    
+    async def fetch_genre(genre: str) -> List[Dict[str, Any]]:
+        logger.info(f"Warming cache for genre: {genre}")
+        seed_genres = await agent._get_valid_seed_genres_for_genz(genre)
+        return await agent._get_spotify_recommendations(
+            seed_genres=seed_genres,
+            limit=GENRE_CACHE_TRACKS
+        )
+    
+    # All genres in flight at once; the shared Spotify rate limiter still paces the calls
+    results = await asyncio.gather(*(fetch_genre(genre) for genre in genres))
+    
+    genre_tracks = {}
+    for genre, tracks in zip(genres, results):
+        if tracks:
+            genre_tracks[genre] = tracks
+        else:
+            logger.warning(f"No tracks fetched for genre: {genre}")
+    
+    return genre_tracks
+
+
 @celery_app.task(
     bind=True,
     name='core.tasks.music.warm_genre_cache',
@@ -26,27 +76,31 @@ def warm_genre_cache(self):
     """
     try:
         # Pre-fetch popular tracks for all 6 GenZ genres
-        genres = [
-            "Lo-fi Chill", "Pop Anthems", "Hype Beats", 
-            "Indie Vibes", "R&B Feels", "Sad Boy Hours"
-        ]
+        genre_tracks = asyncio.run(_fetch_genre_tracks(GENZ_GENRES))
         
-        rate_limiter = SpotifyRateLimiter()
+        # Update the genres that were fetched in one round-trip; genres that
+        # failed this run keep their previous tracks
+        if not recommendations_cache.hset_all(GENRE_CACHE_PREFIX, genre_tracks, ttl=RECOMMENDATIONS_TTL):
+            raise RuntimeError("failed to store warmed genre tracks")
         
-        for genre in genres:
-            # This would pre-populate the cache with genre recommendations
-            # When users request, they get instant cached results
-            logger.info(f"Warming cache for genre: {genre}")
-            # Implementation would call your existing rate-limited Spotify service
-            
         logger.info("Genre cache warming completed successfully")
-        return {"status": "success", "genres_warmed": len(genres)}
+        return {"status": "success", "genres_warmed": len(genre_tracks)}
         
     except Exception as e:
         logger.error(f"Cache warming failed: {str(e)}")
         raise self.retry(countdown=300, max_retries=3)  # Retry in 5 minutes
 
 
+def get_cached_genre_tracks() -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Read every warmed genre with one HGETALL.
+    
+    Returns:
+        Mapping of genre to tracks (empty if the cache is cold)
+    """
+    return recommendations_cache.hget_all(GENRE_CACHE_PREFIX)
+
+
 # Optional: Add this to celery_app.py beat_schedule ONLY if you want cache warming
 CACHE_WARMING_SCHEDULE = {
     'warm-music-genre-cache': {
@@ -0,0 +1,65 @@
+-- Conversation Memory Cleanup Procedure Migration
+-- Deletes conversation memories (and their memory_index entries) older than a
+-- cutoff entirely inside Postgres, so the cleanup task makes one call instead
+-- of fetching rows to the API and deleting them one request at a time.
+-- Rows are deleted in bounded batches and each batch is committed on its own,
+-- so row locks are held for one batch only and never across the whole cleanup.
+--
+-- This is a PROCEDURE (transaction control is not allowed in functions), so it
+-- cannot be called through the PostgREST RPC endpoint. Run it with CALL over a
+-- direct connection (DATABASE_URL), outside an explicit transaction block:
+--   CALL public.cleanup_old_conversation_memories(90, 5000, NULL);
+-- The INOUT p_deleted column of the result holds the number of conversation
+-- memories deleted.
+
+-- Replaces the earlier single-transaction function of the same name
+DROP FUNCTION IF EXISTS public.cleanup_old_conversation_memories(INTEGER, INTEGER);
+
+-- The existing time indexes lead with user_id, so they can't serve a
+-- cross-user "older than cutoff" scan; these make each batch an index range scan
+CREATE INDEX IF NOT EXISTS idx_conversation_memories_end_time
+    ON conversation_memories(end_time);
+
+CREATE INDEX IF NOT EXISTS idx_memory_index_timestamp_only
+    ON memory_index(timestamp);
+
+CREATE OR REPLACE PROCEDURE public.cleanup_old_conversation_memories(
+    p_older_than_days INTEGER DEFAULT 90,
+    p_batch_size INTEGER DEFAULT 5000,
+    INOUT p_deleted INTEGER DEFAULT NULL
+) AS $$
+DECLARE
+    cutoff TIMESTAMPTZ := NOW() - make_interval(days => p_older_than_days);
+    batch_deleted INTEGER;
+BEGIN
+    p_deleted := 0;
+
+    LOOP
+        DELETE FROM conversation_memories
+        WHERE id IN (
+            SELECT id FROM conversation_memories
+            WHERE end_time < cutoff
+            LIMIT p_batch_size
+        );
+        GET DIAGNOSTICS batch_deleted = ROW_COUNT;
+        p_deleted := p_deleted + batch_deleted;
+        COMMIT;
+        EXIT WHEN batch_deleted < p_batch_size;
+    END LOOP;
+
+    LOOP
+        DELETE FROM memory_index
+        WHERE id IN (
+            SELECT id FROM memory_index
+            WHERE timestamp < cutoff
+            LIMIT p_batch_size
+        );
+        GET DIAGNOSTICS batch_deleted = ROW_COUNT;
+        COMMIT;
+        EXIT WHEN batch_deleted < p_batch_size;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Maintenance only: callable by the database owner, not by app users
+REVOKE EXECUTE ON PROCEDURE public.cleanup_old_conversation_memories(INTEGER, INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
@@ -0,0 +1,42 @@
+-- Stored Audio Features Lookup Function Migration
+-- Returns the audio features already stored in listening_history for a set of
+-- tracks, one row per track, so the listening history refresh only calls the
+-- Spotify audio-features endpoint for tracks nobody has stored yet.
+-- A plain .in_('track_id', ...) select returns one row per user per track, so
+-- its size grows with the user count and can be cut off by PostgREST's row
+-- cap; this result is bounded by the number of track IDs passed in.
+-- Rows stored after a failed audio-features call (all features NULL) are skipped.
+-- Uses idx_listening_history_track_id.
+CREATE OR REPLACE FUNCTION public.get_stored_audio_features(p_track_ids TEXT[])
+RETURNS TABLE (
+    track_id TEXT,
+    energy NUMERIC,
+    valence NUMERIC,
+    danceability NUMERIC,
+    acousticness NUMERIC,
+    instrumentalness NUMERIC,
+    speechiness NUMERIC,
+    liveness NUMERIC,
+    tempo NUMERIC
+) AS $$
+    SELECT DISTINCT ON (lh.track_id)
+        lh.track_id,
+        lh.energy,
+        lh.valence,
+        lh.danceability,
+        lh.acousticness,
+        lh.instrumentalness,
+        lh.speechiness,
+        lh.liveness,
+        lh.tempo
+    FROM listening_history lh
+    WHERE lh.track_id = ANY(p_track_ids)
+      AND num_nonnulls(
+          lh.energy, lh.valence, lh.danceability, lh.acousticness,
+          lh.instrumentalness, lh.speechiness, lh.liveness, lh.tempo
+      ) > 0
+    -- Most recently played copy of each track
+    ORDER BY lh.track_id, lh.last_played_at DESC NULLS LAST;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION public.get_stored_audio_features IS 'Returns stored audio features for the given tracks, one row per track';
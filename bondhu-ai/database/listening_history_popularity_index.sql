@@ -0,0 +1,6 @@
+-- Listening History Popularity Index Migration
+-- Supports the cold start "popular tracks" query, which orders the whole
+-- listening_history table by popularity with no user filter:
+--   SELECT * FROM listening_history ORDER BY popularity DESC NULLS LAST LIMIT n
+-- Without this index Postgres performs a full scan + sort on every call.
+CREATE INDEX IF NOT EXISTS idx_listening_history_popularity ON listening_history(popularity DESC NULLS LAST);
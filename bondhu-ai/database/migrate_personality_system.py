@@ -4,7 +4,7 @@ Migration script to convert from old personality system to new adjustment-based
 This script:
 1. Extracts existing personality data from profiles table
 2. Creates personality_surveys records with original survey data
-3. Preserves personality_llm_context
+3. Leaves personality_llm_context in place on profiles
 4. Validates the migration
 5. Provides rollback capability
 
@@ -13,11 +13,13 @@ Run with: python database/migrate_personality_system.py --dry-run (to preview)
 """
 
 import argparse
-import json
+import asyncio
 import logging
+import orjson
 import sys
+import numpy as np
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 
 # Add parent directory to path to import from core
 sys.path.insert(0, '/d/CLLG/DL/Project-Noor/bondhu-ai')
@@ -31,217 +33,493 @@ logging.basicConfig(
 )
 logger = logging.getLogger("bondhu.migration")
 
+# Profiles read per page (Supabase caps responses at 1000 rows by default)
+DEFAULT_PAGE_SIZE = 1000
+
+# Surveys inserted per PostgREST request, and a cap on each request body
+DEFAULT_BATCH_SIZE = 500
+MAX_BATCH_BYTES = 5 * 1024 * 1024
+
+# Insert requests in flight at once
+DEFAULT_CONCURRENCY = 8
+
+# Profile pages read ahead of the writers, and pages being written at once
+PAGE_QUEUE_SIZE = 4
+PAGE_WORKERS = 2
+
+TRAITS = ('openness', 'conscientiousness', 'extraversion', 'agreeableness', 'neuroticism')
+PROFILE_TRAIT_KEYS = tuple(f'personality_{trait}' for trait in TRAITS)
+
+SURVEY_VERSION = '1.0'
+SURVEY_SOURCE = 'migrated'
+RAW_RESPONSES_SOURCE = 'migrated_from_profiles'
+
+# Column order for the COPY bulk-load path
+SURVEY_COPY_COLUMNS = (
+    'user_id', 'survey_version', 'raw_responses',
+    'openness_score', 'conscientiousness_score', 'extraversion_score',
+    'agreeableness_score', 'neuroticism_score',
+    'completed_at', 'survey_duration_seconds', 'survey_source'
+)
+
+# User IDs per in_() filter (resume check and validation): each UUID adds ~37
+# bytes to the request URL, so this keeps it around 6KB, well under common
+# proxy/PostgREST URL limits
+USER_ID_CHUNK_SIZE = 150
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp from PostgREST for binary COPY."""
+    if value is None:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
 
 class PersonalityMigration:
     """Handles migration from old to new personality system."""
     
-    def __init__(self, dry_run: bool = True):
+    def __init__(
+        self,
+        dry_run: bool = True,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        use_copy: bool = False,
+        resume: bool = False
+    ):
         self.dry_run = dry_run
+        self.resume = resume
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        
+        # COPY needs a direct Postgres connection; otherwise stay on the REST API
+        self.postgres_url = get_config().database.postgres_url
+        self.use_copy = use_copy and bool(self.postgres_url)
+        if use_copy and not self.postgres_url:
+            logger.warning("--use-copy needs DATABASE_URL - falling back to REST inserts")
+        self._pg_conn = None
+        # Pages are migrated concurrently; the COPY connection runs one at a time
+        self._copy_lock = asyncio.Lock()
+        
+        # Caps insert requests in flight across all pages
+        self._insert_slots = asyncio.Semaphore(concurrency)
+        
+        # One timestamp for the whole run rather than one per user
+        self._migrated_at_iso = datetime.now(timezone.utc).isoformat()
         self.supabase = get_supabase_client()
+        
+        # Table request builders are reusable; each query builds its own request
+        self._profiles = self.supabase.supabase.table('profiles')
+        self._surveys = self.supabase.supabase.table('personality_surveys')
         self.migration_stats = {
             'users_processed': 0,
             'surveys_created': 0,
+            'already_migrated': 0,
+            'incomplete_scores': 0,
             'errors': [],
             'skipped': []
         }
     
-    def fetch_existing_personalities(self) -> List[Dict[str, Any]]:
-        """Fetch all users with personality assessments from profiles table."""
-        try:
-            logger.info("Fetching existing personality profiles...")
+    def iter_existing_personalities(
+        self, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield users with personality assessments from profiles table, one page at a time.
+        
+        Args:
+            page_size: Profiles fetched per request
             
-            result = self.supabase.supabase.table('profiles').select(
-                'id, full_name, '
-                'personality_openness, personality_conscientiousness, '
-                'personality_extraversion, personality_agreeableness, personality_neuroticism, '
-                'personality_llm_context, personality_completed_at, '
-                'has_completed_personality_assessment, created_at'
-            ).eq('has_completed_personality_assessment', True).execute()
+        Yields:
+            Lists of profile rows (at most page_size each)
+        """
+        logger.info("Fetching existing personality profiles...")
+        offset = 0
+        
+        while True:
+            try:
+                query = self._profiles.select(
+                    'id, full_name, '
+                    'personality_openness, personality_conscientiousness, '
+                    'personality_extraversion, personality_agreeableness, personality_neuroticism, '
+                    'personality_llm_context, personality_completed_at, '
+                    'has_completed_personality_assessment, created_at'
+                ).eq('has_completed_personality_assessment', True)
+                
+                # Incomplete assessments are filtered out by the database
+                for key in PROFILE_TRAIT_KEYS:
+                    query = query.not_.is_(key, 'null')
+                
+                result = query.order('id').range(offset, offset + page_size - 1).execute()
+                
+            except Exception as e:
+                logger.error(f"Failed to fetch personalities at offset {offset}: {e}")
+                # Remaining pages are unread, so the run must not report success
+                self.migration_stats['errors'].append({
+                    'user_id': f"(profiles page at offset {offset})",
+                    'error': str(e)
+                })
+                return
             
             users = result.data or []
-            logger.info(f"Found {len(users)} users with personality assessments")
-            return users
+            if users:
+                logger.info(f"Fetched {len(users)} users with personality assessments (offset {offset})")
+                yield users
+            
+            if len(users) < page_size:
+                return
+            offset += page_size
+    
+    def count_incomplete_personalities(self) -> int:
+        """
+        Count assessed users with a missing trait score (excluded from the migration).
+        
+        Returns:
+            Number of incomplete profiles (0 if the count fails)
+        """
+        try:
+            result = self._profiles.select('id', count='exact', head=True).eq(
+                'has_completed_personality_assessment', True
+            ).or_(
+                ','.join(f'personality_{trait}.is.null' for trait in TRAITS)
+            ).execute()
+            return result.count or 0
             
         except Exception as e:
-            logger.error(f"Failed to fetch personalities: {e}")
-            return []
+            logger.warning(f"Could not count incomplete personality profiles: {e}")
+            return 0
     
-    def create_survey_record(self, user_data: Dict[str, Any]) -> Optional[str]:
+    def _build_survey_row(self, user_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
-        Create a personality_surveys record from old profile data.
+        Build a personality_surveys row from old profile data.
         
         Args:
             user_data: Profile data from old system
             
         Returns:
-            Survey ID if successful, None otherwise
+            Row dict, or None if the user has incomplete scores (recorded as skipped)
         """
-        try:
-            user_id = user_data['id']
-            
-            # Extract Big Five scores
-            scores = {
-                'openness': user_data.get('personality_openness', 50),
-                'conscientiousness': user_data.get('personality_conscientiousness', 50),
-                'extraversion': user_data.get('personality_extraversion', 50),
-                'agreeableness': user_data.get('personality_agreeableness', 50),
-                'neuroticism': user_data.get('personality_neuroticism', 50)
-            }
-            
-            # Check if any scores are null (incomplete assessment)
-            if any(v is None for v in scores.values()):
-                logger.warning(f"User {user_id} has incomplete personality scores - skipping")
-                self.migration_stats['skipped'].append({
-                    'user_id': user_id,
-                    'reason': 'incomplete_scores'
-                })
-                return None
-            
-            # Extract LLM context for raw_responses
-            llm_context = user_data.get('personality_llm_context', {})
-            if not isinstance(llm_context, dict):
-                llm_context = {}
-            
-            # Build raw_responses from available data
-            raw_responses = {
-                'source': 'migrated_from_profiles',
-                'original_llm_context': llm_context,
-                'migrated_at': datetime.now(timezone.utc).isoformat(),
-                'original_completed_at': user_data.get('personality_completed_at'),
-                'scores': scores
-            }
-            
-            if self.dry_run:
-                logger.info(f"[DRY RUN] Would create survey for user {user_id}")
-                logger.info(f"  Scores: {scores}")
-                self.migration_stats['surveys_created'] += 1
-                return f"dry-run-{user_id}"
-            
-            # Create the survey record
-            result = self.supabase.supabase.table('personality_surveys').insert({
+        user_id = user_data['id']
+        
+        # Extract Big Five scores (in TRAITS order)
+        scores = tuple(user_data.get(key, 50) for key in PROFILE_TRAIT_KEYS)
+        
+        # Check if any scores are null (incomplete assessment)
+        if None in scores:
+            logger.warning(f"User {user_id} has incomplete personality scores - skipping")
+            self.migration_stats['skipped'].append({
                 'user_id': user_id,
-                'survey_version': '1.0',
-                'raw_responses': raw_responses,
-                'openness_score': scores['openness'],
-                'conscientiousness_score': scores['conscientiousness'],
-                'extraversion_score': scores['extraversion'],
-                'agreeableness_score': scores['agreeableness'],
-                'neuroticism_score': scores['neuroticism'],
-                'completed_at': user_data.get('personality_completed_at') or user_data.get('created_at'),
-                'survey_duration_seconds': None,
-                'survey_source': 'migrated'
-            }).execute()
+                'reason': 'incomplete_scores'
+            })
+            return None
+        
+        # Extract LLM context for raw_responses
+        llm_context = user_data.get('personality_llm_context', {})
+        if not isinstance(llm_context, dict):
+            llm_context = {}
+        
+        # Build raw_responses from available data
+        raw_responses = {
+            'source': RAW_RESPONSES_SOURCE,
+            'original_llm_context': llm_context,
+            'migrated_at': self._migrated_at_iso,
+            'original_completed_at': user_data.get('personality_completed_at'),
+            'scores': dict(zip(TRAITS, scores))
+        }
+        
+        if self.dry_run:
+            # Per-row output is DEBUG only; pages are summarized at INFO
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"[DRY RUN] Would create survey for user {user_id}")
+                logger.debug(f"  Scores: {raw_responses['scores']}")
+        
+        openness, conscientiousness, extraversion, agreeableness, neuroticism = scores
+        return {
+            'user_id': user_id,
+            'survey_version': SURVEY_VERSION,
+            'raw_responses': raw_responses,
+            'openness_score': openness,
+            'conscientiousness_score': conscientiousness,
+            'extraversion_score': extraversion,
+            'agreeableness_score': agreeableness,
+            'neuroticism_score': neuroticism,
+            'completed_at': user_data.get('personality_completed_at') or user_data.get('created_at'),
+            'survey_duration_seconds': None,
+            'survey_source': SURVEY_SOURCE
+        }
+    
+    def _iter_chunks(self, rows: List[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        """Split rows into insert chunks bounded by row count and estimated payload size."""
+        chunk: List[Dict[str, Any]] = []
+        chunk_bytes = 0
+        for row in rows:
+            row_bytes = len(orjson.dumps(row, default=str))
+            if chunk and (len(chunk) >= self.batch_size or chunk_bytes + row_bytes > MAX_BATCH_BYTES):
+                yield chunk
+                chunk, chunk_bytes = [], 0
+            chunk.append(row)
+            chunk_bytes += row_bytes
+        if chunk:
+            yield chunk
+    
+    def _insert_rows(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insert a chunk of survey rows in one request.
+        
+        Users that already have a survey of this version are left untouched
+        (ON CONFLICT DO NOTHING), so re-running the migration is safe. A failed chunk (payload too large, or a bad row failing the whole
+        statement) is retried as two halves, so only the offending rows are
+        recorded as errors.
+        
+        Args:
+            rows: Survey rows to insert
+            
+        Returns:
+            Newly inserted rows as returned by Supabase
+        """
+        try:
+            result = self._surveys.upsert(
+                rows, on_conflict='user_id,survey_version', ignore_duplicates=True
+            ).execute()
+            return result.data or []
             
-            if result.data and len(result.data) > 0:
-                survey_id = result.data[0]['id']
-                logger.info(f"Created survey {survey_id} for user {user_id}")
-                self.migration_stats['surveys_created'] += 1
-                return survey_id
-            else:
-                logger.error(f"Failed to create survey for user {user_id}: no data returned")
-                self.migration_stats['errors'].append({
-                    'user_id': user_id,
-                    'error': 'no_data_returned'
-                })
-                return None
-                
         except Exception as e:
-            logger.error(f"Error creating survey for user {user_data.get('id')}: {e}")
+            if len(rows) > 1:
+                mid = len(rows) // 2
+                logger.warning(f"Insert of {len(rows)} surveys failed ({e}) - retrying as two halves")
+                return self._insert_rows(rows[:mid]) + self._insert_rows(rows[mid:])
+            
+            user_id = rows[0]['user_id']
+            logger.error(f"Error creating survey for user {user_id}: {e}")
             self.migration_stats['errors'].append({
-                'user_id': user_data.get('id'),
+                'user_id': user_id,
                 'error': str(e)
             })
-            return None
+            return []
     
-    def preserve_llm_context(self, user_data: Dict[str, Any]) -> bool:
+    async def _copy_rows(self, rows: List[Dict[str, Any]]) -> Optional[Dict[str, str]]:
         """
-        Ensure personality_llm_context is preserved in profiles table.
-        This field will continue to be used for LLM prompt context.
+        Bulk-load survey rows with a binary COPY over a direct Postgres connection.
         
         Args:
-            user_data: Profile data
+            rows: Survey rows to insert
             
         Returns:
-            True if successful
+            Mapping of user ID to created survey ID, or None if the COPY failed
+            (nothing is written in that case)
         """
+        import asyncpg
+        
         try:
-            user_id = user_data['id']
-            llm_context = user_data.get('personality_llm_context')
+            records = [
+                tuple(
+                    orjson.dumps(row[col]).decode() if col == 'raw_responses'
+                    else _parse_timestamp(row[col]) if col == 'completed_at'
+                    else row[col]
+                    for col in SURVEY_COPY_COLUMNS
+                )
+                for row in rows
+            ]
+            user_ids = [row['user_id'] for row in rows]
             
-            if not llm_context:
-                logger.debug(f"No LLM context to preserve for user {user_id}")
-                return True
-            
-            if self.dry_run:
-                logger.info(f"[DRY RUN] Would preserve LLM context for user {user_id}")
-                return True
+            async with self._copy_lock:
+                if self._pg_conn is None:
+                    self._pg_conn = await asyncpg.connect(self.postgres_url)
+                conn = self._pg_conn
+                
+                async with conn.transaction():
+                    # Losing the tail of a crashed bulk load is fine; it is simply re-run
+                    await conn.execute("SET LOCAL synchronous_commit = OFF")
+                    await conn.copy_records_to_table(
+                        'personality_surveys', records=records, columns=SURVEY_COPY_COLUMNS
+                    )
+                    created = await conn.fetch(
+                        "SELECT user_id::text, id::text FROM personality_surveys "
+                        "WHERE user_id = ANY($1::uuid[]) AND survey_version = $2",
+                        user_ids, SURVEY_VERSION
+                    )
             
-            # LLM context is already in the profiles table, just verify it's there
-            result = self.supabase.supabase.table('profiles').select(
-                'personality_llm_context'
-            ).eq('id', user_id).execute()
+            logger.info(f"Copied {len(rows)} surveys")
+            return {record['user_id']: record['id'] for record in created}
             
-            if result.data and len(result.data) > 0:
-                logger.debug(f"LLM context preserved for user {user_id}")
-                return True
-            else:
-                logger.warning(f"Could not verify LLM context for user {user_id}")
-                return False
-                
         except Exception as e:
-            logger.error(f"Error preserving LLM context for user {user_data.get('id')}: {e}")
-            return False
+            logger.warning(f"COPY of {len(rows)} surveys failed ({e}) - falling back to REST inserts")
+            return None
+    
+    async def _insert_chunks(self, rows: List[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Insert survey rows through the REST API in concurrent chunks.
+        
+        Up to `concurrency` chunks are in flight at once (across all pages);
+        the Supabase client is synchronous, so each insert runs in a worker thread.
+        
+        Args:
+            rows: Survey rows to insert
+            
+        Returns:
+            Mapping of user ID to created survey ID
+        """
+        survey_ids: Dict[str, str] = {}
+        
+        async def insert_chunk(chunk: List[Dict[str, Any]]) -> None:
+            async with self._insert_slots:
+                inserted = await asyncio.to_thread(self._insert_rows, chunk)
+            survey_ids.update((row['user_id'], row['id']) for row in inserted)
+            logger.debug(f"Inserted {len(inserted)}/{len(chunk)} surveys ({len(survey_ids)} in page)")
+        
+        await asyncio.gather(*(insert_chunk(chunk) for chunk in self._iter_chunks(rows)))
+        return survey_ids
     
-    def validate_migration(self, user_data: Dict[str, Any], survey_id: str) -> bool:
+    async def bulk_create_survey_records(self, users: List[Dict[str, Any]]) -> Dict[str, str]:
         """
-        Validate that migration was successful for a user.
+        Create personality_surveys records for many users in bulk.
+        
+        Uses COPY when enabled, otherwise (or if the COPY fails) chunked
+        REST inserts.
         
         Args:
-            user_data: Original profile data
-            survey_id: Created survey ID
+            users: Profile data from old system
             
         Returns:
-            True if validation passes
+            Mapping of user ID to created survey ID
         """
+        rows = [row for row in map(self._build_survey_row, users) if row is not None]
+        
         if self.dry_run:
-            return True
+            self.migration_stats['surveys_created'] += len(rows)
+            return {row['user_id']: f"dry-run-{row['user_id']}" for row in rows}
+        
+        survey_ids = await self._copy_rows(rows) if self.use_copy and rows else None
+        if survey_ids is None:
+            survey_ids = await self._insert_chunks(rows)
+        
+        # Rows that raised were already recorded; the rest already had a survey
+        failed = {error['user_id'] for error in self.migration_stats['errors']}
+        for row in rows:
+            if row['user_id'] not in survey_ids and row['user_id'] not in failed:
+                logger.debug(f"User {row['user_id']} already has a migrated survey - left unchanged")
+                self.migration_stats['already_migrated'] += 1
+        
+        self.migration_stats['surveys_created'] += len(survey_ids)
+        return survey_ids
+    
+    def _filter_already_migrated(self, users: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drop users that already have a survey of this version (for --resume).
         
+        Args:
+            users: One page of profile data
+            
+        Returns:
+            Users still to migrate
+        """
+        user_ids = [user_data['id'] for user_data in users]
+        done = set()
         try:
-            user_id = user_data['id']
+            # Chunk the IN list to keep request URLs within PostgREST limits
+            for i in range(0, len(user_ids), USER_ID_CHUNK_SIZE):
+                result = self._surveys.select('user_id').eq(
+                    'survey_version', SURVEY_VERSION
+                ).in_('user_id', user_ids[i:i + USER_ID_CHUNK_SIZE]).execute()
+                done.update(row['user_id'] for row in result.data or [])
             
-            # Check survey was created
-            survey_result = self.supabase.supabase.table('personality_surveys').select(
-                'id, openness_score, conscientiousness_score, extraversion_score, '
-                'agreeableness_score, neuroticism_score'
-            ).eq('user_id', user_id).execute()
+        except Exception as e:
+            # Not fatal: conflicting rows are ignored by the insert anyway
+            logger.warning(f"Could not check for already migrated users: {e}")
+            return users
+        
+        self.migration_stats['already_migrated'] += len(done)
+        return [user_data for user_data in users if user_data['id'] not in done]
+    
+    def validate_migration_bulk(self, users: List[Dict[str, Any]]) -> List[str]:
+        """
+        Validate that migration was successful for many users.
+        
+        Fetches the created surveys with one query per chunk of IDs and
+        compares scores locally.
+        
+        Args:
+            users: Original profile data of migrated users
             
-            if not survey_result.data or len(survey_result.data) == 0:
-                logger.error(f"Validation failed: Survey not found for user {user_id}")
-                return False
+        Returns:
+            IDs of users that failed validation
+        """
+        if self.dry_run or not users:
+            return []
+        
+        failed: List[str] = []
+        try:
+            by_user: Dict[str, Dict[str, Any]] = {}
+            user_ids = [user_data['id'] for user_data in users]
             
-            survey = survey_result.data[0]
+            # Chunk the IN list to keep request URLs within PostgREST limits
+            for i in range(0, len(user_ids), USER_ID_CHUNK_SIZE):
+                result = self._surveys.select(
+                    'user_id, ' + ', '.join(f'{trait}_score' for trait in TRAITS)
+                ).eq(
+                    'survey_version', SURVEY_VERSION
+                ).in_('user_id', user_ids[i:i + USER_ID_CHUNK_SIZE]).execute()
+                
+                for survey in result.data or []:
+                    by_user.setdefault(survey['user_id'], survey)
             
-            # Verify scores match
-            score_matches = (
-                survey['openness_score'] == user_data.get('personality_openness') and
-                survey['conscientiousness_score'] == user_data.get('personality_conscientiousness') and
-                survey['extraversion_score'] == user_data.get('personality_extraversion') and
-                survey['agreeableness_score'] == user_data.get('personality_agreeableness') and
-                survey['neuroticism_score'] == user_data.get('personality_neuroticism')
-            )
+            found = []
+            for user_data in users:
+                if user_data['id'] in by_user:
+                    found.append(user_data)
+                else:
+                    logger.error(f"Validation failed: Survey not found for user {user_data['id']}")
+                    failed.append(user_data['id'])
             
-            if not score_matches:
-                logger.error(f"Validation failed: Scores don't match for user {user_id}")
-                return False
+            if found:
+                # Compare all scores as two (users, traits) arrays; float so a
+                # missing (None -> NaN) or fractional score never matches by accident
+                old = np.array(
+                    [[user_data.get(key) for key in PROFILE_TRAIT_KEYS] for user_data in found],
+                    dtype=np.float64
+                )
+                new = np.array(
+                    [[by_user[user_data['id']][f'{trait}_score'] for trait in TRAITS] for user_data in found],
+                    dtype=np.float64
+                )
+                
+                for idx in np.flatnonzero(~(old == new).all(axis=1)):
+                    user_id = found[idx]['id']
+                    logger.error(f"Validation failed: Scores don't match for user {user_id}")
+                    failed.append(user_id)
             
-            logger.info(f"Validation passed for user {user_id}")
-            return True
+            logger.info(f"Validation passed for {len(users) - len(failed)}/{len(users)} users")
+            return failed
             
         except Exception as e:
-            logger.error(f"Validation error for user {user_data.get('id')}: {e}")
-            return False
+            logger.error(f"Validation error: {e}")
+            return [user_data['id'] for user_data in users]
+    
+    async def _produce_pages(self, queue: asyncio.Queue) -> None:
+        """Feed pages of profiles to the page workers, then one stop marker per worker."""
+        pages = self.iter_existing_personalities()
+        while (users := await asyncio.to_thread(next, pages, None)) is not None:
+            await queue.put(users)
+        for _ in range(PAGE_WORKERS):
+            await queue.put(None)
     
-    def run_migration(self) -> Dict[str, Any]:
+    async def _consume_pages(self, queue: asyncio.Queue, validation_failures: List[str]) -> None:
+        """Migrate and validate pages of profiles until the stop marker."""
+        while (users := await queue.get()) is not None:
+            self.migration_stats['users_processed'] += len(users)
+            if self.resume:
+                users = await asyncio.to_thread(self._filter_already_migrated, users)
+            survey_ids = await self.bulk_create_survey_records(users)
+            logger.info(
+                f"{'[DRY RUN] Would create' if self.dry_run else 'Created'} {len(survey_ids)}/{len(users)} "
+                f"surveys for page ({self.migration_stats['surveys_created']} total)"
+            )
+            
+            # Validate migrated users (personality_llm_context stays on profiles untouched)
+            validation_failures.extend(await asyncio.to_thread(
+                self.validate_migration_bulk,
+                [user_data for user_data in users if user_data['id'] in survey_ids]
+            ))
+    
+    async def run_migration(self) -> Dict[str, Any]:
         """
         Execute the full migration process.
         
@@ -252,31 +530,26 @@ class PersonalityMigration:
         logger.info(f"Starting personality system migration (DRY RUN: {self.dry_run})")
         logger.info("=" * 60)
         
-        # Fetch existing personalities
-        users = self.fetch_existing_personalities()
+        # Read profiles while earlier pages are being written; the bounded
+        # queue stops reading ahead when the writers fall behind
+        self.migration_stats['incomplete_scores'] = await asyncio.to_thread(
+            self.count_incomplete_personalities
+        )
+        validation_failures: List[str] = []
+        queue: asyncio.Queue = asyncio.Queue(maxsize=PAGE_QUEUE_SIZE)
+        await asyncio.gather(
+            self._produce_pages(queue),
+            *(self._consume_pages(queue, validation_failures) for _ in range(PAGE_WORKERS))
+        )
+        
+        if self._pg_conn is not None:
+            await self._pg_conn.close()
+            self._pg_conn = None
         
-        if not users:
+        if not self.migration_stats['users_processed']:
             logger.warning("No users found to migrate")
             return self.migration_stats
         
-        # Process each user
-        for user_data in users:
-            self.migration_stats['users_processed'] += 1
-            user_id = user_data['id']
-            
-            logger.info(f"\nProcessing user {user_id} ({self.migration_stats['users_processed']}/{len(users)})")
-            
-            # Create survey record
-            survey_id = self.create_survey_record(user_data)
-            if not survey_id:
-                continue
-            
-            # Preserve LLM context
-            self.preserve_llm_context(user_data)
-            
-            # Validate migration
-            self.validate_migration(user_data, survey_id)
-        
         # Print summary
         logger.info("\n" + "=" * 60)
         logger.info("MIGRATION SUMMARY")
@@ -284,8 +557,12 @@ class PersonalityMigration:
         logger.info(f"Mode: {'DRY RUN' if self.dry_run else 'EXECUTION'}")
         logger.info(f"Users processed: {self.migration_stats['users_processed']}")
         logger.info(f"Surveys created: {self.migration_stats['surveys_created']}")
+        logger.info(f"Already migrated: {self.migration_stats['already_migrated']}")
         logger.info(f"Users skipped: {len(self.migration_stats['skipped'])}")
+        logger.info(f"Incomplete assessments (not fetched): {self.migration_stats['incomplete_scores']}")
         logger.info(f"Errors: {len(self.migration_stats['errors'])}")
+        if not self.dry_run:
+            logger.info(f"Validation failures: {len(validation_failures)}")
         
         if self.migration_stats['skipped']:
             logger.info("\nSkipped users:")
@@ -317,6 +594,28 @@ def main():
         action='store_true',
         help='Execute migration (makes database changes)'
     )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f'Surveys inserted per request (default: {DEFAULT_BATCH_SIZE})'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f'Insert requests in flight at once (default: {DEFAULT_CONCURRENCY})'
+    )
+    parser.add_argument(
+        '--use-copy',
+        action='store_true',
+        help='Bulk-load with COPY over a direct Postgres connection (needs DATABASE_URL)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Skip users that already have a migrated survey before inserting'
+    )
     
     args = parser.parse_args()
     
@@ -332,8 +631,14 @@ def main():
             sys.exit(0)
     
     # Run migration
-    migration = PersonalityMigration(dry_run=args.dry_run)
-    results = migration.run_migration()
+    migration = PersonalityMigration(
+        dry_run=args.dry_run,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        use_copy=args.use_copy,
+        resume=args.resume
+    )
+    results = asyncio.run(migration.run_migration())
     
     # Exit with appropriate code
     if results['errors']:
@@ -0,0 +1,6 @@
+-- Recommendations Cache Expiry Default Migration
+-- Lets the database stamp cache rows instead of the API computing timestamps
+-- per request: generated_at already defaults to now(), expires_at now defaults
+-- to the 24 hour recommendations TTL.
+ALTER TABLE recommendations_cache
+ALTER COLUMN expires_at SET DEFAULT (now() + interval '24 hours');
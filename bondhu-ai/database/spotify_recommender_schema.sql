@@ -66,6 +66,7 @@ CREATE INDEX IF NOT EXISTS idx_listening_history_user_id ON listening_history(us
 CREATE INDEX IF NOT EXISTS idx_listening_history_played_at ON listening_history(played_at DESC);
 CREATE INDEX IF NOT EXISTS idx_listening_history_user_played ON listening_history(user_id, played_at DESC);
 CREATE INDEX IF NOT EXISTS idx_listening_history_track_id ON listening_history(track_id);
+CREATE INDEX IF NOT EXISTS idx_listening_history_popularity ON listening_history(popularity DESC NULLS LAST);
 
 -- ============================================================================
 -- RECOMMENDATIONS CACHE TABLE
@@ -95,7 +96,7 @@ CREATE TABLE IF NOT EXISTS recommendations_cache (
     
     -- Cache management
     generated_at timestamp with time zone default now() not null,
-    expires_at timestamp with time zone not null,
+    expires_at timestamp with time zone default (now() + interval '24 hours') not null,
     is_valid boolean default true,
     cache_hit_count integer default 0,
     last_accessed_at timestamp with time zone,
@@ -47,41 +47,45 @@ def test_redis_connection():
             password=config.redis.password,
             socket_connect_timeout=5,
             socket_timeout=5,
-            decode_responses=True
+            decode_responses=False
         )
         
-        # Ping test
-        result = client.ping()
-        logger.info(f"✅ Ping successful: {result}")
-        
-        # Set/Get test
         test_key = "bondhu:test:connection"
         test_value = "Connection successful!"
         
-        client.set(test_key, test_value, ex=60)  # Expire in 60 seconds
-        retrieved_value = client.get(test_key)
+        # All probes in one round-trip
+        pipe = client.pipeline(transaction=False)
+        pipe.ping()
+        pipe.set(test_key, test_value, ex=60)  # Expire in 60 seconds
+        pipe.get(test_key)
+        pipe.info('server')
+        pipe.info('memory')
+        pipe.info('clients')
+        pipe.delete(test_key)
+        result, _, retrieved_value, info, memory_info, clients_info, _ = pipe.execute()
         
+        # Ping test
+        logger.info(f"✅ Ping successful: {result}")
+        
+        # Set/Get test
+        retrieved_value = retrieved_value.decode('utf-8') if retrieved_value is not None else None
         logger.info(f"✅ Write test successful: Set '{test_key}' = '{test_value}'")
         logger.info(f"✅ Read test successful: Got '{test_key}' = '{retrieved_value}'")
         
-        # Get server info
-        info = client.info('server')
+        # Server info
         logger.info(f"\n📊 Redis Server Info:")
         logger.info(f"   Version: {info.get('redis_version', 'N/A')}")
         logger.info(f"   Mode: {info.get('redis_mode', 'N/A')}")
         logger.info(f"   OS: {info.get('os', 'N/A')}")
         
-        # Get memory info
-        memory_info = client.info('memory')
+        # Memory info
         used_memory_mb = memory_info.get('used_memory', 0) / 1024 / 1024
         logger.info(f"   Memory Used: {used_memory_mb:.2f} MB")
         
-        # Get connection info
-        clients_info = client.info('clients')
+        # Connection info
         logger.info(f"   Connected Clients: {clients_info.get('connected_clients', 0)}")
         
-        # Cleanup
-        client.delete(test_key)
+        # Cleanup (test key already deleted in the pipeline)
         client.close()
         
         logger.info("\n" + "=" * 60)
@@ -4,6 +4,8 @@ Quick script to test conversation summarization
 import asyncio
 from core.database.supabase_client import get_supabase_client
 
+RECENT_MESSAGE_LIMIT = 50
+
 async def test_session_messages():
     """Check if messages exist for our test session"""
     client = get_supabase_client()
@@ -13,15 +15,19 @@ async def test_session_messages():
     
     print(f"\n=== Checking messages for session: {session_id} ===\n")
     
+    # One query for the user's latest messages; split by session locally
     response = client.supabase.table("chat_messages") \
         .select("id, sender_type, message_text, session_id, timestamp") \
         .eq("user_id", user_id) \
-        .eq("session_id", session_id) \
-        .order("timestamp", desc=False) \
+        .order("timestamp", desc=True) \
+        .limit(RECENT_MESSAGE_LIMIT) \
         .execute()
     
-    messages = response.data
-    print(f"Found {len(messages)} messages:\n")
+    rows = response.data or []
+    messages = [msg for msg in reversed(rows) if msg['session_id'] == session_id]
+    other_messages = [msg for msg in rows if msg['session_id'] != session_id][:10]
+    
+    print(f"Found {len(messages)} messages (among the latest {RECENT_MESSAGE_LIMIT}):\n")
     
     for i, msg in enumerate(messages, 1):
         print(f"{i}. [{msg['sender_type']}] {msg['message_text'][:60]}...")
@@ -32,15 +38,8 @@ async def test_session_messages():
         print("❌ No messages found! The session_id might not be saved correctly.")
         print("\nLet's check all recent messages for this user:")
         
-        all_response = client.supabase.table("chat_messages") \
-            .select("id, sender_type, message_text, session_id, timestamp") \
-            .eq("user_id", user_id) \
-            .order("timestamp", desc=True) \
-            .limit(10) \
-            .execute()
-        
         print(f"\nLast 10 messages:")
-        for msg in all_response.data:
+        for msg in other_messages:
             print(f"- [{msg['sender_type']}] Session: {msg.get('session_id', 'NO SESSION ID')}")
             print(f"  {msg['message_text'][:80]}...")
             print()